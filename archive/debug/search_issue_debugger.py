@@ -6,8 +6,10 @@ and writes an enriched CSV for ingestion.
 import argparse  # For parsing CLI arguments
 import logging  # For logging progress and warnings
 import sqlite3  # Lightweight local cache database
+import time  # Spacing out requests to the geocoder
 from pathlib import Path  # Filesystem paths
 
+import numpy as np  # Positional column access
 import pandas as pd  # Data handling
 import requests  # HTTP requests for geocoding
 from dotenv import load_dotenv  # Load environment variables
@@ -18,6 +20,14 @@ DEFAULT_INPUT = Path("data") / "associations_raw.csv"
 DEFAULT_OUTPUT = Path("data") / "associations_goteborg_with_coords.csv"
 DEFAULT_CACHE_DB = Path(".geo_cache.sqlite3")
 GEOCODER_URL = "https://nominatim.openstreetmap.org/search"
+MIN_DELAY_SECONDS = 1.1  # Nominatim usage policy: at most one request per second
+
+# Shared across calls: one HTTP session (keep-alive, created on the first
+# external request), the time of the last request for rate limiting, and
+# results already looked up in this run
+_session = None
+_last_request = 0.0
+_memo = {}
 
 
 def init_logging():
@@ -47,7 +57,27 @@ def geocode(address: str, conn: sqlite3.Connection, api_key: str = None):
     """
     Return (lat, lon) for an address, using cache if available,
     otherwise querying the external geocoding service.
+    Repeats within a run (ignoring case and surrounding space) are answered from memory.
     """
+    address = str(address)
+    key = address.strip().lower()
+    if key not in _memo:
+        _memo[key] = _lookup(address, conn, api_key)
+    return _memo[key]
+
+
+def _get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def _lookup(address: str, conn: sqlite3.Connection, api_key: str = None):
+    """Look up one address in the SQLite cache, then the geocoding service."""
+    global _last_request
+
     # Check cache first
     row = conn.execute(
         "SELECT latitude, longitude FROM geocode_cache WHERE address = ?",
@@ -56,19 +86,25 @@ def geocode(address: str, conn: sqlite3.Connection, api_key: str = None):
     if row:
         return row
 
+    # Respect the rate limit across calls
+    wait = MIN_DELAY_SECONDS - (time.monotonic() - _last_request)
+    if wait > 0:
+        time.sleep(wait)
+    _last_request = time.monotonic()
+
     # Make external request if not cached
     try:
         params = {"q": address, "format": "json", "limit": 1}
         if api_key:
             params["key"] = api_key
-        resp = requests.get(GEOCODER_URL, params=params, timeout=10)
+        resp = _get_session().get(GEOCODER_URL, params=params, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         if not data:
             raise ValueError(f"No results for '{address}'")
         lat, lon = float(data[0]["lat"]), float(data[0]["lon"])
     except Exception as e:
-        logging.warning(f"Geocoding failed for '{address}': {e}")
+        logging.warning("Geocoding failed for %r: %s", address, e)
         return None, None
 
     # Cache the successful result
@@ -79,7 +115,7 @@ def geocode(address: str, conn: sqlite3.Connection, api_key: str = None):
         )
         conn.commit()
     except Exception as e:
-        logging.warning(f"Failed to cache geocode for '{address}': {e}")
+        logging.warning("Failed to cache geocode for %r: %s", address, e)
 
     return lat, lon
 
@@ -113,17 +149,31 @@ def main():
     # Prepare cache connection
     cache_conn = open_cache(args.cache_db)
 
-    # Geocode entries missing coordinates
-    for idx, row in df.iterrows():
-        if pd.isna(row[lat_col]) or pd.isna(row[lon_col]):
-            address = row.get("address") or row.get("club_name") or ""
-            if not address:
-                logging.warning(f"No address for row {idx}; skipping")
-                continue
-            lat, lon = geocode(address, cache_conn, args.api_key)
-            if lat is not None:
-                df.at[idx, lat_col] = lat
-                df.at[idx, lon_col] = lon
+    # Geocode entries missing coordinates, reading plain column arrays by position
+    missing = df[lat_col].isna().to_numpy() | df[lon_col].isna().to_numpy()
+    no_value = np.full(len(df), None, dtype=object)
+    addresses = df["address"].to_numpy(dtype=object) if "address" in df.columns else no_value
+    club_names = df["club_name"].to_numpy(dtype=object) if "club_name" in df.columns else no_value
+    found_rows, found_lats, found_lons = [], [], []
+    for pos in np.flatnonzero(missing):
+        # First of address / club name that is neither NaN nor blank
+        address = next((v for v in (addresses[pos], club_names[pos])
+                        if not pd.isna(v) and str(v).strip()), "")
+        if not address:
+            logging.warning("No address for row %s; skipping", df.index[pos])
+            continue
+        lat, lon = geocode(address, cache_conn, args.api_key)
+        if lat is not None:
+            found_rows.append(pos)
+            found_lats.append(lat)
+            found_lons.append(lon)
+
+    logging.info("Geocoded %d/%d rows missing coordinates", len(found_rows), int(missing.sum()))
+
+    # Write all found coordinates back in one assignment per column
+    if found_rows:
+        df.loc[df.index[found_rows], lat_col] = found_lats
+        df.loc[df.index[found_rows], lon_col] = found_lons
 
     # Write the enriched CSV
     args.output_csv.parent.mkdir(parents=True, exist_ok=True)
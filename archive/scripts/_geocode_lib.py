@@ -0,0 +1,277 @@
+# _geocode_lib.py
+"""
+Shared geocoding core for the Göteborg data scripts:
+ - normalisation for cache keys,
+ - disk-cached results in an append-only Parquet dataset (seeded from the
+   old pickle/SQLite caches on first use),
+ - checkpoints written by a background thread,
+ - thread-based parallelism with geopy RateLimiter (imported only when fetching).
+
+Scripts only read their CSV, call `geocode_series` on the address column
+and write the result.
+"""
+import logging  # Progress and debug logs
+import os  # For environment variables
+import pickle  # Reading the legacy pickle cache
+import queue  # Hand-off to the checkpoint writer
+import re  # Regex for address normalisation
+import sqlite3  # Reading the legacy SQLite cache
+import threading  # Background checkpoint writer
+import uuid  # Unique names for cache batch files
+from concurrent.futures import ThreadPoolExecutor, as_completed  # Parallelism
+from pathlib import Path  # Filesystem paths
+from typing import Callable, Dict, Iterator, List, Optional, Tuple  # Type hints
+
+import pandas as pd  # Data handling
+import pyarrow as pa  # Columnar cache batches
+import pyarrow.dataset as pads  # Reading the cache directory
+import pyarrow.parquet as pq  # Writing cache batches
+from tqdm import tqdm  # Progress bars
+
+# Configuration constants
+DEFAULT_CACHE_DIR = Path("data/geocode_cache")
+# Caches written by the scripts before they shared this core
+LEGACY_PICKLE_CACHE = Path("data/geocode_cache.pkl")
+LEGACY_SQLITE_CACHE = Path(".geo_cache.sqlite3")
+CHECKPOINT_INTERVAL = 1000
+MIN_DELAY_SECONDS = 1.1
+USER_AGENT = "golden_goal_geo"
+
+logger = logging.getLogger(__name__)
+
+Cache = Dict[str, Tuple[Optional[float], Optional[float]]]
+
+_PUNCT_TABLE = str.maketrans("", "", ",.")
+_GATAN_OR_SPACE = re.compile(r"\bgatan\b|\s+")
+
+_limiter = None
+
+
+def _gatan_or_space(m: re.Match) -> str:
+    return "g" if m.group(0) == "gatan" else " "
+
+
+def normalize_address(addr: str) -> str:
+    """Standardise addresses for cache keys: lowercase, remove punctuation, collapse spaces."""
+    s = addr.strip().lower().translate(_PUNCT_TABLE)
+    return _GATAN_OR_SPACE.sub(_gatan_or_space, s)
+
+
+def normalize_addresses(addrs: pd.Series) -> pd.Series:
+    """Normalise each distinct address once and map the results back onto the column."""
+    # Not Series.str.replace: Arrow's regex \b is ASCII-only and would rewrite "sjögatan".
+    mapping = {a: normalize_address(a) for a in addrs.dropna().unique()}
+    return addrs.map(mapping)
+
+
+def load_legacy_caches(
+    pickle_path: Path = LEGACY_PICKLE_CACHE, sqlite_path: Path = LEGACY_SQLITE_CACHE
+) -> Cache:
+    """Read the old pickle and SQLite geocode caches, keyed by normalised address."""
+    cache: Cache = {}
+    if sqlite_path.exists():
+        try:
+            with sqlite3.connect(str(sqlite_path)) as conn:
+                rows = conn.execute("SELECT address, latitude, longitude FROM geocode_cache").fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Could not read legacy cache %s: %s", sqlite_path, e)
+            rows = []
+        for addr, lat, lon in rows:
+            if addr:
+                cache[normalize_address(str(addr))] = (lat, lon)
+        logger.info("Read %d entries from legacy cache %s", len(rows), sqlite_path)
+    if pickle_path.exists():
+        try:
+            with open(pickle_path, "rb") as f:
+                entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning("Could not read legacy cache %s: %s", pickle_path, e)
+            entries = {}
+        # The pickle was written by the company geocoder, so its entries win
+        for addr, (lat, lon) in entries.items():
+            cache[normalize_address(str(addr))] = (lat, lon)
+        logger.info("Read %d entries from legacy cache %s", len(entries), pickle_path)
+    return cache
+
+
+def load_cache(cache_dir: Path = DEFAULT_CACHE_DIR) -> Cache:
+    """
+    Load existing address-to-(lat,lon) cache from the Parquet dataset.
+
+    When there is no dataset yet, entries from the legacy pickle/SQLite
+    caches are imported into it so earlier lookups are not fetched again.
+    """
+    if cache_dir.exists() and any(cache_dir.glob("*.parquet")):
+        table = pads.dataset(cache_dir, format="parquet").to_table()
+        addrs = table.column("address").to_pylist()
+        lats = table.column("lat").to_pylist()
+        lons = table.column("lon").to_pylist()
+        cache = dict(zip(addrs, zip(lats, lons)))
+        logger.info("Loaded %d cached addresses", len(cache))
+        return cache
+
+    cache = load_legacy_caches()
+    if cache:
+        save_cache([(addr, lat, lon) for addr, (lat, lon) in cache.items()], cache_dir)
+        logger.info("Imported %d legacy cached addresses into %s", len(cache), cache_dir)
+    else:
+        logger.info("No existing cache; starting fresh")
+    return cache
+
+
+def save_cache(delta: List[Tuple[str, Optional[float], Optional[float]]], cache_dir: Path = DEFAULT_CACHE_DIR):
+    """Append the entries geocoded since the last checkpoint as one Parquet batch file."""
+    if not delta:
+        return
+    addrs, lats, lons = (list(col) for col in zip(*delta))
+    table = pa.table({
+        "address": pa.array(addrs, type=pa.string()),
+        "lat": pa.array(lats, type=pa.float64()),
+        "lon": pa.array(lons, type=pa.float64()),
+    })
+    cache_dir.mkdir(exist_ok=True, parents=True)
+    # Write under a dot-name (ignored by the dataset reader) and swap in atomically
+    final = cache_dir / f"batch-{uuid.uuid4().hex}.parquet"
+    tmp = cache_dir / f".{final.name}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, final)
+    logger.info("Checkpoint: appended %d entries to cache", len(delta))
+
+
+def coords_frame(norm: pd.Series, cache: Cache) -> pd.DataFrame:
+    """Look up normalised addresses in `cache`; returns address_norm/lat/lon on `norm`'s index."""
+    return pd.DataFrame({
+        "address_norm": norm,
+        "lat": norm.map(lambda x: cache.get(x, (None, None))[0]),
+        "lon": norm.map(lambda x: cache.get(x, (None, None))[1]),
+    }, index=norm.index)
+
+
+def checkpoint_writer(jobs: "queue.Queue", cache_dir: Path, norm: pd.Series,
+                      on_checkpoint: Optional[Callable[[pd.DataFrame], None]]):
+    """Background loop persisting (delta, cache snapshot) jobs until it receives None."""
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        delta, snapshot = job
+        try:
+            save_cache(delta, cache_dir)
+            if on_checkpoint is not None:
+                on_checkpoint(coords_frame(norm[norm.isin(snapshot)], snapshot))
+        except Exception as e:
+            logger.error("Checkpoint failed: %s", e)
+
+
+def init_geocoder(min_delay_seconds: float = MIN_DELAY_SECONDS):
+    """Initialise the geocoder and rate-limiter shared by the worker threads."""
+    # geopy is only needed when something has to be fetched, so import it here
+    from geopy.adapters import RequestsAdapter  # Pooled keep-alive HTTP session
+    from geopy.extra.rate_limiter import RateLimiter  # Rate-limiting for API
+    from geopy.geocoders import Nominatim  # Geocoding service
+
+    global _limiter
+    nominatim_url = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org")
+    geocoder = Nominatim(
+        user_agent=USER_AGENT,
+        timeout=10,
+        domain=nominatim_url.replace("https://", "").replace("http://", ""),
+        scheme=nominatim_url.split("://")[0],
+        # One requests.Session shared by all worker threads, so lookups reuse
+        # connections instead of a new TCP/TLS handshake each time
+        adapter_factory=RequestsAdapter,
+    )
+    _limiter = RateLimiter(
+        geocoder.geocode,
+        min_delay_seconds=min_delay_seconds,
+        max_retries=3,
+        error_wait_seconds=5.0,
+        swallow_exceptions=False,
+    )
+
+
+def _query_variants(addr_norm: str) -> Iterator[str]:
+    """Yield query strings lazily so the fallback is only built when needed."""
+    yield addr_norm
+    yield f"{addr_norm}, sweden"
+
+
+def geocode_one(addr_norm: str) -> Tuple[str, Optional[float], Optional[float]]:
+    """
+    Attempt to geocode the normalised address, optionally appending ', sweden'.
+    Returns (address_norm, lat, lon).
+    Transient errors are retried with backoff by the RateLimiter itself.
+    """
+    from geopy.exc import GeocoderServiceError  # Errors left after retries
+
+    for query in _query_variants(addr_norm):
+        try:
+            loc = _limiter(query, country_codes="se", exactly_one=True)
+        except GeocoderServiceError as e:
+            logger.debug("Error geocoding %r: %s", query, e)
+            continue
+        if loc:
+            return addr_norm, loc.latitude, loc.longitude
+    # Return None if both attempts fail
+    return addr_norm, None, None
+
+
+def geocode_series(
+    addresses: pd.Series,
+    *,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    min_delay_seconds: float = MIN_DELAY_SECONDS,
+    workers: int = 4,
+    progress: bool = True,
+    on_checkpoint: Optional[Callable[[pd.DataFrame], None]] = None,
+) -> pd.DataFrame:
+    """
+    Geocode a column of free-text addresses.
+
+    Normalises, deduplicates, serves what it can from the Parquet cache and
+    fetches the rest from Nominatim, appending new results to the cache.
+    Returns a frame with columns address_norm, lat, lon aligned on
+    `addresses.index`. `on_checkpoint`, if given, is called from the writer
+    thread with the rows resolved so far.
+    """
+    norm = normalize_addresses(addresses)
+
+    cache = load_cache(cache_dir)
+    unique_norm = norm.dropna().unique().tolist()
+    to_geo = [a for a in unique_norm if a not in cache]
+    logger.info("Need to geocode %d/%d unique addresses", len(to_geo), len(unique_norm))
+
+    if to_geo:
+        delta = []
+        jobs = queue.Queue(maxsize=1)
+        writer = threading.Thread(
+            target=checkpoint_writer, args=(jobs, cache_dir, norm, on_checkpoint), daemon=True
+        )
+        writer.start()
+        init_geocoder(min_delay_seconds)
+        with ThreadPoolExecutor(max_workers=workers) as exe:
+            futures = {exe.submit(geocode_one, addr): addr for addr in to_geo}
+            it = tqdm(as_completed(futures), total=len(futures), desc="Geocoding", disable=not progress)
+            for i, fut in enumerate(it, start=1):
+                addr = futures[fut]
+                try:
+                    _, lat, lon = fut.result()
+                except Exception as e:
+                    logger.debug("Late error for %r: %s", addr, e)
+                    lat, lon = None, None
+                cache[addr] = (lat, lon)
+                delta.append((addr, lat, lon))
+
+                # Hand off a checkpoint; if the writer is still busy, keep the
+                # delta and retry at the next interval
+                if i % CHECKPOINT_INTERVAL == 0:
+                    try:
+                        jobs.put_nowait((delta, dict(cache)))
+                        delta = []
+                    except queue.Full:
+                        logger.debug("Checkpoint writer busy; deferring %d entries", len(delta))
+        jobs.put(None)
+        writer.join()
+        save_cache(delta, cache_dir)
+
+    return coords_frame(norm, cache)
@@ -8,6 +8,8 @@ import sys  # For exiting on error
 from pathlib import Path  # Filesystem paths
 
 import pandas as pd  # DataFrame handling
+import pyarrow as pa  # Arrow string types
+import pyarrow.csv as pacsv  # Multithreaded CSV reader
 
 # Fields we care about extracting
 DESIRED = ["PeOrgNr", "Gatuadress", "PostNr", "PostOrt"]
@@ -50,21 +52,31 @@ def main(scb_path: Path):
     # Determine which columns match our DESIRED fields
     col_map = infer_columns(actual_cols)
 
-    # Load only those relevant columns
+    # Load only those relevant columns as Arrow strings (keeps leading zeros)
     print("Loading columns:", list(col_map.keys()))
-    df = pd.read_csv(scb_path, sep="\t", usecols=list(col_map.keys()),
-                     dtype=str, encoding="latin1", low_memory=False)
+    table = pacsv.read_csv(
+        scb_path,
+        read_options=pacsv.ReadOptions(encoding="latin1"),
+        parse_options=pacsv.ParseOptions(delimiter="\t"),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(col_map.keys()),
+            column_types={c: pa.string() for c in col_map},
+        ),
+    )
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
 
     # Rename to logical field names
     df = df.rename(columns=col_map)
 
-    # Normalize district field and filter
-    df["PostOrt_norm"] = df["PostOrt"].str.strip().str.lower()
-    df = df[df["PostOrt_norm"].isin(LOWER_DISTRICTS)].copy()
+    # Normalize district field and filter (kept as a local, never a column)
+    norm = df["PostOrt"].str.strip().str.lower()
+    keep = norm.isin(LOWER_DISTRICTS)
+    df = df[keep].copy()
     print(f"→ {len(df)} firms in Göteborg municipality")
 
     # Map back to canonical district names
-    df["district"] = df["PostOrt_norm"].map(DISTRICT_MAP)
+    df["district"] = norm[keep].map(DISTRICT_MAP)
+    del norm, keep
 
     # Build full registered address
     df["registered_address"] = (
@@ -76,7 +88,8 @@ def main(scb_path: Path):
     # Output the key fields to CSV
     dest = Path("data") / "gothenburg_companies_addresses.csv"
     dest.parent.mkdir(parents=True, exist_ok=True)
-    df[["PeOrgNr", "district", "registered_address"]].to_csv(dest, index=False, encoding="utf-8")
+    out = pa.Table.from_pandas(df[["PeOrgNr", "district", "registered_address"]], preserve_index=False)
+    pacsv.write_csv(out, dest, write_options=pacsv.WriteOptions(include_header=True))
     print(f"Wrote {len(df)} rows to {dest}")
 
 
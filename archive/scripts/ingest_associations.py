@@ -9,9 +9,10 @@ from pathlib import Path  # Filesystem paths
 
 import pandas as pd  # Data loading
 from dotenv import load_dotenv  # Load environment credentials
+from sqlalchemy import inspect  # Table existence check
 from sqlalchemy.exc import SQLAlchemyError  # Database error handling
 
-from golden_goal.core.db import get_engine  # Obtain SQLAlchemy engine
+from golden_goal.core.db import get_engine, get_infile_engine  # Obtain SQLAlchemy engines
 
 
 def init_logging():
@@ -22,17 +23,67 @@ def init_logging():
     )
 
 
+def load_csv_infile(conn, csv_path: Path, table: str, columns):
+    """
+    Stream `csv_path` into `table` server-side with LOAD DATA LOCAL INFILE (MySQL).
+    Empty fields become NULL, as they do when pandas reads the file.
+    """
+    targets = ", ".join(f"@v{i}" for i in range(len(columns)))
+    assignments = ", ".join(f"`{col}` = NULLIF(@v{i}, '')" for i, col in enumerate(columns))
+    conn.exec_driver_sql(
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        "LINES TERMINATED BY '\\n' IGNORE 1 LINES "
+        f"({targets}) SET {assignments}",
+        (str(csv_path.resolve()),),
+    )
+
+
+def replace_via_staging(engine, df: pd.DataFrame, csv_path: Path, table: str = "associations"):
+    """
+    Replace `table` on MySQL without ever leaving it empty.
+
+    MySQL commits DDL immediately, so the rows go into a staging table first:
+    LOAD DATA LOCAL INFILE when the server allows it, otherwise batched INSERTs.
+    Only a complete staging table is swapped in, with one atomic RENAME TABLE.
+    """
+    staging, old = f"{table}_staging", f"{table}_old"
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS `{staging}`")
+        # Create the staging table from the frame's dtypes
+        df.head(0).to_sql(name=staging, con=conn, if_exists="replace", index=False)
+
+    try:
+        with engine.begin() as conn:
+            load_csv_infile(conn, csv_path, staging, list(df.columns))
+    except SQLAlchemyError as e:
+        # e.g. the server runs with local_infile=OFF (the MySQL 8 default)
+        logging.warning(f"LOAD DATA LOCAL INFILE failed ({e}); falling back to batched INSERTs")
+        with engine.begin() as conn:
+            df.to_sql(name=staging, con=conn, if_exists="append", index=False,
+                      method="multi", chunksize=1000)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS `{old}`")
+        if inspect(conn).has_table(table):
+            conn.exec_driver_sql(f"RENAME TABLE `{table}` TO `{old}`, `{staging}` TO `{table}`")
+            conn.exec_driver_sql(f"DROP TABLE `{old}`")
+        else:
+            conn.exec_driver_sql(f"RENAME TABLE `{staging}` TO `{table}`")
+
+
 def ingest(csv_path: Path):
     """
     Load the CSV at `csv_path` into the `associations` table.
-    Uses SQLAlchemy's `to_sql` with `if_exists='replace'`.
+    The table is recreated from the CSV's columns (`to_sql` with `if_exists='replace'`);
+    on MySQL the rows are bulk-loaded into a staging table that is then swapped in.
     """
     if not csv_path.exists():
         logging.error(f"CSV file not found: {csv_path}")
         return
 
     try:
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, engine="pyarrow")  # multithreaded parser
         logging.info(f"Loaded {len(df)} rows from {csv_path}")
     except Exception as e:
         logging.error(f"Failed to read CSV {csv_path}: {e}")
@@ -40,15 +91,20 @@ def ingest(csv_path: Path):
 
     engine = get_engine()
     try:
-        # Begin transaction; drop and recreate table content atomically
-        with engine.begin() as conn:
-            df.to_sql(
-                name="associations",
-                con=conn,
-                if_exists="replace",
-                index=False,
-                method="multi"  # Batch inserts where supported
-            )
+        if engine.dialect.name == "mysql":
+            # Client-side LOCAL INFILE is only enabled on this dedicated connection;
+            # the server must allow it too, or replace_via_staging falls back
+            replace_via_staging(get_infile_engine(engine), df, csv_path)
+        else:
+            # Begin transaction; drop and recreate table content atomically
+            with engine.begin() as conn:
+                df.to_sql(
+                    name="associations",
+                    con=conn,
+                    if_exists="replace",
+                    index=False,
+                    method="multi"  # Batch inserts where supported
+                )
         logging.info(f"Successfully wrote {len(df)} rows to `associations` table.")
     except SQLAlchemyError as e:
         logging.error(f"Database error during ingest: {e}")
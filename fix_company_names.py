@@ -3,6 +3,7 @@
 fix_company_names.py - Generate better company names and optimize performance
 """
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 from golden_goal.core.db import get_engine
@@ -53,6 +54,17 @@ def generate_company_name(row):
     
     return name
 
+def get_districts(lats, lons):
+    """Rough district for each coordinate pair (simplified bands around central Göteborg)."""
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    # Conditions are checked in order, like an if/elif chain
+    return np.select(
+        [lats > 57.75, lats < 57.65, lons > 12.0, lons < 11.9],
+        ["Angered", "Frölunda", "Örgryte", "Majorna"],
+        default="Centrum",
+    )
+
 def update_company_names():
     """Update company names in the database."""
     engine = get_engine()
@@ -68,43 +80,41 @@ def update_company_names():
         total = conn.execute(text("SELECT COUNT(*) FROM companies")).scalar()
         logger.info(f"Total companies to update: {total}")
         
-        # Process in chunks
-        for offset in range(0, total, chunk_size):
+        # Process in chunks, paging on the primary key (OFFSET would rescan all skipped rows)
+        last_id = 0  # ids are auto-increment, so they start at 1
+        while True:
             # Read chunk
             chunk_df = pd.read_sql(
                 text(f"""
                 SELECT id, orgnr, name, size_bucket, industry, lat, lon 
                 FROM companies 
-                LIMIT {chunk_size} OFFSET {offset}
+                WHERE id > :last_id
+                ORDER BY id
+                LIMIT {chunk_size}
                 """), 
-                conn
+                conn,
+                params={"last_id": last_id}
             )
+            if chunk_df.empty:
+                break
+            last_id = int(chunk_df['id'].iloc[-1])
             
             # Add district based on coordinates (simplified)
-            def get_district(lat, lon):
-                if lat > 57.75:
-                    return "Angered"
-                elif lat < 57.65:
-                    return "Frölunda"
-                elif lon > 12.0:
-                    return "Örgryte"
-                elif lon < 11.9:
-                    return "Majorna"
-                else:
-                    return "Centrum"
-            
-            chunk_df['district'] = chunk_df.apply(lambda r: get_district(r['lat'], r['lon']), axis=1)
+            chunk_df['district'] = get_districts(chunk_df['lat'], chunk_df['lon'])
             
             # Generate new names
             chunk_df['new_name'] = chunk_df.apply(generate_company_name, axis=1)
             
-            # Update in database
+            # Update in database: one executemany per chunk instead of a statement per row
+            params = [
+                {"name": name, "id": company_id}
+                for name, company_id in zip(chunk_df['new_name'].tolist(), chunk_df['id'].tolist())
+            ]
             with engine.begin() as trans_conn:
-                for _, row in chunk_df.iterrows():
-                    trans_conn.execute(
-                        text("UPDATE companies SET name = :name WHERE id = :id"),
-                        {"name": row['new_name'], "id": row['id']}
-                    )
+                trans_conn.execute(
+                    text("UPDATE companies SET name = :name WHERE id = :id"),
+                    params
+                )
             
             total_updated += len(chunk_df)
             logger.info(f"Updated {total_updated} company names...")
@@ -5,21 +5,32 @@ golden_goal/core/config.py
 Application configuration and constants.
 """
 
+import functools
 import os
 from pathlib import Path
 from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
 
-load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def _load_env():
+    """Read .env into the environment once per process."""
+    load_dotenv()
+    return True
+
+
+_load_env()
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent.parent.resolve()
 DATA_DIR = BASE_DIR / "data"
 MODELS_DIR = BASE_DIR / "models"
 
+@functools.lru_cache(maxsize=1)
 def get_database_url():
-    """Construct the database URL with proper encoding for the password."""
+    """Construct the database URL with proper encoding for the password (built once per process)."""
+    _load_env()
     mysql_user = os.getenv("MYSQL_USER", "sponsor_user")
     mysql_password = os.getenv("MYSQL_PASSWORD", "Sports-2025?!")
     mysql_host = os.getenv("MYSQL_HOST", "localhost")
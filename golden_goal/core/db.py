@@ -6,14 +6,40 @@ Database engine factory using SQLAlchemy.
 """
 
 import logging
+from functools import lru_cache
 
-from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
 from sqlalchemy.exc import SQLAlchemyError
 
-load_dotenv()
+from .config import _load_env
+
+# Read .env now (once per process): scripts read flags such as USE_SKLEARNEX from
+# the environment before they first call get_engine()
+_load_env()
+
 _engine = None
 
+
+@lru_cache(maxsize=None)
+def _make_engine(url):
+    """Create one pooled engine per URL, so repeated callers share its connections."""
+    try:
+        engine = create_engine(
+            url,
+            pool_size=8,
+            max_overflow=16,
+            pool_recycle=3600,
+            pool_pre_ping=True,
+            echo=False
+        )
+        logging.info("Database engine created successfully")
+    except SQLAlchemyError as e:
+        logging.error(f"Failed to create database engine: {e}")
+        raise
+    return engine
+
+
 def get_engine():
     """
     Get or create the global database engine.
@@ -27,17 +53,14 @@ def get_engine():
         if not DATABASE_URL:
             raise RuntimeError("DATABASE_URL not configured")
 
-        try:
-            _engine = create_engine(
-                DATABASE_URL,
-                pool_size=5,
-                max_overflow=10,
-                pool_recycle=3600,
-                pool_pre_ping=True,
-                echo=False
-            )
-            logging.info("Database engine created successfully")
-        except SQLAlchemyError as e:
-            logging.error(f"Failed to create database engine: {e}")
-            raise
-    return _engine
\ No newline at end of file
+        _engine = _make_engine(DATABASE_URL)
+    return _engine
+
+
+def get_infile_engine(engine):
+    """
+    Unpooled engine on the same database as `engine` with LOAD DATA LOCAL INFILE
+    enabled on the client. Only the bulk loaders use it, so the app's pooled
+    connections never let the server request local files.
+    """
+    return create_engine(engine.url, poolclass=NullPool, connect_args={"local_infile": True})
@@ -7,6 +7,7 @@ CLEAN FINAL VERSION: No IDE warnings, better score distribution.
 
 import logging
 import math
+import pickle
 import random
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple
@@ -32,6 +33,19 @@ def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return R * c
 
 
+def haversine_many(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """Vectorised haversine: distances (km) from one point to arrays of points."""
+    R = 6371.0
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lons, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(a))
+    return R * c
+
+
 class ScoringWeights:
     """Validate and hold weights for scoring components."""
     def __init__(self, distance=0.4, size_match=0.3, cluster_match=0.2, industry_affinity=0.1):
@@ -168,6 +182,12 @@ def calculate_industry_affinity(company_industry: str, company_name: str = "") -
     return max(0.1, min(0.9, base_score + variation))
 
 
+def _as_center_dtype(kmeans, features) -> np.ndarray:
+    """Cast features to the model's centroid dtype; KMeans.predict rejects a mismatch (float32 models)."""
+    centers = getattr(kmeans, 'cluster_centers_', None)
+    return np.asarray(features, dtype=centers.dtype if centers is not None else np.float64)
+
+
 def predict_cluster_safe(model_data: Union[Dict, object], lat: float, lon: float) -> Optional[int]:
     """Safely predict cluster label."""
     if not model_data:
@@ -187,16 +207,44 @@ def predict_cluster_safe(model_data: Union[Dict, object], lat: float, lon: float
                 features = scaler.transform(features)
 
             if hasattr(kmeans, 'predict'):
-                return int(kmeans.predict(features)[0])
+                return int(kmeans.predict(_as_center_dtype(kmeans, features))[0])
         else:
             if hasattr(model_data, 'predict'):
-                return int(model_data.predict(features)[0])
+                return int(model_data.predict(_as_center_dtype(model_data, features))[0])
     except Exception as e:
         logger.debug(f"Cluster prediction failed: {e}")
 
     return None
 
 
+def predict_clusters(model_data: Union[Dict, object], lats: List[float], lons: List[float]) -> List[Optional[int]]:
+    """Vectorised predict_cluster_safe: one model call for many points (None where it fails)."""
+    n = len(lats)
+    if not model_data or n == 0:
+        return [None] * n
+
+    try:
+        features = np.column_stack([lats, lons]).astype(np.float64)
+        kmeans = model_data
+
+        if isinstance(model_data, dict):
+            scaler = model_data.get('scaler')
+            kmeans = model_data.get('kmeans')
+
+            if kmeans is None:
+                return [None] * n
+
+            if scaler is not None:
+                features = scaler.transform(features)
+
+        if hasattr(kmeans, 'predict'):
+            return [int(c) for c in kmeans.predict(_as_center_dtype(kmeans, features))]
+    except Exception as e:
+        logger.debug(f"Cluster prediction failed: {e}")
+
+    return [None] * n
+
+
 def calculate_cluster_score(assoc_cluster: Optional[int], comp_cluster: Optional[int]) -> float:
     """Calculate cluster matching score."""
     if assoc_cluster is None or comp_cluster is None:
@@ -208,45 +256,31 @@ def calculate_cluster_score(assoc_cluster: Optional[int], comp_cluster: Optional
         return 0.3 + random.uniform(0, 0.1)
 
 
-def get_association_details(engine: Engine, association_id: int) -> Optional[Tuple]:
-    """Get association details from database."""
-    with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT id, name, lat, lon, size_bucket
-            FROM associations
-            WHERE id = :id
-        """), {"id": association_id}).fetchone()
-
-        if not result:
-            logger.warning(f"Association {association_id} not found")
-            return None
-
-        return result
-
-
-def get_nearby_companies(engine: Engine, lat: float, lon: float, max_distance: float) -> List:
-    """Get companies within distance range."""
-    lat_range = max_distance / 111.0
-    lon_range = max_distance / (111.0 * math.cos(math.radians(lat)))
+def get_association_with_nearby_companies(engine: Engine, association_id: int, max_distance: float) -> List:
+    """
+    Fetch an association and the companies in its bounding box in one round-trip.
 
+    Rows are (assoc id, name, lat, lon, size_bucket, company id, name, lat, lon,
+    size_bucket, industry, approx_distance); the company columns are NULL in the
+    single row returned when nothing is in range. Empty if the association is unknown.
+    """
     with engine.connect() as conn:
         return conn.execute(text("""
-            SELECT id, name, lat, lon, size_bucket, industry,
-                   SQRT(POWER(lat - :center_lat, 2) + POWER(lon - :center_lon, 2)) * 111.0 as approx_distance
-            FROM companies
-            WHERE lat BETWEEN :min_lat AND :max_lat
-              AND lon BETWEEN :min_lon AND :max_lon
-              AND lat IS NOT NULL
-              AND lon IS NOT NULL
+            SELECT a.id, a.name, a.lat, a.lon, a.size_bucket,
+                   c.id, c.name, c.lat, c.lon, c.size_bucket, c.industry,
+                   SQRT(POWER(c.lat - a.lat, 2) + POWER(c.lon - a.lon, 2)) * 111.0 as approx_distance
+            FROM associations a
+            LEFT JOIN companies c
+              ON c.lat BETWEEN a.lat - :lat_range AND a.lat + :lat_range
+             AND c.lon BETWEEN a.lon - :max_distance / (111.0 * COS(RADIANS(a.lat)))
+                           AND a.lon + :max_distance / (111.0 * COS(RADIANS(a.lat)))
+            WHERE a.id = :id
             ORDER BY approx_distance
             LIMIT 5000
         """), {
-            "min_lat": lat - lat_range,
-            "max_lat": lat + lat_range,
-            "min_lon": lon - lon_range,
-            "max_lon": lon + lon_range,
-            "center_lat": lat,
-            "center_lon": lon
+            "id": association_id,
+            "lat_range": max_distance / 111.0,
+            "max_distance": max_distance
         }).fetchall()
 
 
@@ -283,12 +317,13 @@ def score_and_rank_optimized(
 
     engine = get_engine()
 
-    # Get association details
-    assoc_details = get_association_details(engine, association_id)
-    if not assoc_details:
+    # Get association details and nearby companies in one query
+    rows = get_association_with_nearby_companies(engine, association_id, max_distance)
+    if not rows:
+        logger.warning(f"Association {association_id} not found")
         return []
 
-    assoc_id, assoc_name, assoc_lat, assoc_lon, assoc_size = assoc_details
+    assoc_id, assoc_name, assoc_lat, assoc_lon, assoc_size = rows[0][:5]
 
     logger.info(f"Scoring for {assoc_name} (provided bucket: {bucket}, actual size: {assoc_size})")
 
@@ -300,25 +335,40 @@ def score_and_rank_optimized(
         if model:
             assoc_cluster = predict_cluster_safe(model, assoc_lat, assoc_lon)
 
-    # Get nearby companies
-    companies = get_nearby_companies(engine, assoc_lat, assoc_lon, max_distance)
+    companies = [row[5:] for row in rows if row[5] is not None]
     logger.info(f"Found {len(companies)} companies in range")
 
+    # Cluster all candidates up front: one predict per model instead of one per company
+    comp_clusters = [None] * len(companies)
+    if models and assoc_cluster is not None:
+        for model_key in ("default", "large"):
+            idx = [i for i, comp_row in enumerate(companies)
+                   if ("large" if comp_row[4] == "large" else "default") == model_key]
+            clusters = predict_clusters(models.get(model_key),
+                                        [companies[i][2] for i in idx],
+                                        [companies[i][3] for i in idx])
+            for i, cluster in zip(idx, clusters):
+                comp_clusters[i] = cluster
+
     recommendations = []
     seen_locations = set()
 
+    # Exact distances for all candidates in one vectorised pass
+    distances = haversine_many(assoc_lat, assoc_lon,
+                               [comp_row[2] for comp_row in companies],
+                               [comp_row[3] for comp_row in companies]).tolist()
+
     # Score each company
-    for comp_row in companies:
+    for i, comp_row in enumerate(companies):
         comp_id, comp_name, comp_lat, comp_lon, comp_size, comp_industry, _ = comp_row
 
-        # Calculate exact distance
-        distance_km = haversine(assoc_lat, assoc_lon, comp_lat, comp_lon)
+        distance_km = distances[i]
         if distance_km > max_distance:
             continue
 
         # Location penalty for same building
         location_key = f"{comp_lat:.4f},{comp_lon:.4f}"
-        location_count = sum(1 for k in seen_locations if k == location_key)
+        location_count = 1 if location_key in seen_locations else 0
         location_penalty = 0.05 * location_count
         seen_locations.add(location_key)
 
@@ -333,8 +383,7 @@ def score_and_rank_optimized(
             model_key = "large" if comp_size == "large" else "default"
             comp_model = models.get(model_key)
             if comp_model:
-                comp_cluster = predict_cluster_safe(comp_model, comp_lat, comp_lon)
-                cluster_score_value = calculate_cluster_score(assoc_cluster, comp_cluster)
+                cluster_score_value = calculate_cluster_score(assoc_cluster, comp_clusters[i])
 
         # Calculate final score
         final_score = (
@@ -383,11 +432,43 @@ def score_and_rank_optimized(
 score_and_rank = score_and_rank_optimized
 
 
-def recalibrate_models():
-    """Re-train clustering models from current data."""
+def fit_location_clusters(points: np.ndarray, n_clusters: int,
+                          n_init: Union[int, str] = "auto") -> Tuple[object, object]:
+    """
+    Fit a StandardScaler and KMeans on (lat, lon) points.
+
+    Many entities share coordinates (companies in the same building), so each
+    distinct point is fitted once, weighted by how often it occurs. This is the
+    same objective as fitting every row, on a fraction of the data. Fitting runs
+    in float32 (sub-metre resolution at these latitudes), so inputs to predict
+    must be float32 too; predict_cluster_safe takes care of that.
+    """
     from sklearn.cluster import KMeans
     from sklearn.preprocessing import StandardScaler
 
+    unique_points, counts = np.unique(np.asarray(points, dtype=np.float64), axis=0, return_counts=True)
+    unique_points = unique_points.astype(np.float32)
+    scaler = StandardScaler().fit(unique_points, sample_weight=counts)
+    kmeans = KMeans(n_clusters=min(n_clusters, len(unique_points)), random_state=42, n_init=n_init)
+    kmeans.fit(scaler.transform(unique_points), sample_weight=counts)
+    return scaler, kmeans
+
+
+def save_model(model, path: Union[str, Path]) -> None:
+    """
+    Dump a model artifact zlib-compressed (level 3) with the newest pickle protocol.
+
+    Written to a temporary file and swapped in, so a running app never loads a
+    half-written model.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    joblib.dump(model, tmp, compress=3, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+
+
+def recalibrate_models():
+    """Re-train clustering models from current data."""
     engine = get_engine()
 
     with engine.connect() as conn:
@@ -419,17 +500,12 @@ def recalibrate_models():
         if len(data) < 5:
             continue
 
-        X = np.array(data)
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-
         if model_type == 'default':
             n_clusters = min(8, max(3, len(data) // 100))
         else:
             n_clusters = min(5, max(2, len(data) // 20))
 
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        kmeans.fit(X_scaled)
+        scaler, kmeans = fit_location_clusters(np.array(data), n_clusters, n_init=10)
 
         model_data = {
             'kmeans': kmeans,
@@ -439,7 +515,7 @@ def recalibrate_models():
         }
 
         filename = f"kmeans{'_large' if model_type == 'large' else ''}.joblib"
-        joblib.dump(model_data, models_dir / filename)
+        save_model(model_data, models_dir / filename)
         logger.info(f"Saved {model_type} model with {n_clusters} clusters")
 
 
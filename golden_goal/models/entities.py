@@ -5,7 +5,7 @@ golden_goal/models/entities.py
 Domain entity classes for SponsorMatch AI using SQLAlchemy ORM.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Enum
+from sqlalchemy import Column, Integer, String, Float, Enum, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -25,6 +25,12 @@ class Association(Base):
     size_bucket   = Column(Enum('small', 'medium', 'large'))
     founded_year  = Column(Integer)
 
+    __table_args__ = (
+        Index('idx_assoc_name', 'name'),  # exact-name lookups
+        Index('idx_assoc_coords', 'lat', 'lon'),  # bounding-box filters
+        Index('idx_assoc_size', 'size_bucket'),
+    )
+
 class Company(Base):
     """
     Represents a company in the database.
@@ -42,6 +48,13 @@ class Company(Base):
     lat         = Column(Float)
     lon         = Column(Float)
 
+    __table_args__ = (
+        Index('idx_comp_name', 'name'),
+        Index('idx_comp_coords', 'lat', 'lon'),  # nearby-company bounding box
+        Index('idx_comp_size', 'size_bucket'),
+        Index('idx_comp_industry', 'industry'),
+    )
+
 # Legacy dataclasses for backward compatibility
 from dataclasses import dataclass
 from typing import Optional
@@ -6,12 +6,16 @@ FIXED VERSION - Uses associations_prepared.csv for correct size buckets
 """
 
 import logging
+import os
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional, List
 
 import numpy as np
 import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.neighbors import BallTree
 
 from golden_goal.ml.pipeline import score_and_rank_optimized, ScoringWeights
 
@@ -22,8 +26,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Cache for data
+# Cache for data, shared by all service instances; filled once under _data_cache_lock
 _data_cache = {}
+_data_cache_lock = threading.Lock()
+_fuzzy_index_lock = threading.Lock()
 
 
 @dataclass
@@ -45,6 +51,75 @@ class SearchResult:
             self.score = np.clip(self.score, 0.0, 1.0)
 
 
+# Generated Parquet copies live in an ignored subdirectory, never beside the tracked CSVs
+PARQUET_CACHE_DIR = '.parquet_cache'
+
+
+def _read_data_file(csv_path: Path) -> pd.DataFrame:
+    """
+    Read a data CSV through a Parquet copy kept in PARQUET_CACHE_DIR next to it.
+
+    The copy is written on first read and rewritten whenever the CSV is newer, so
+    later cold starts skip CSV parsing. If the copy cannot be written (read-only
+    directory, unconvertible column) the CSV is used as read.
+    """
+    parquet_path = csv_path.parent / PARQUET_CACHE_DIR / f"{csv_path.stem}.parquet"
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        return pd.read_parquet(parquet_path, engine='pyarrow', memory_map=True)
+
+    df = pd.read_csv(csv_path)
+    tmp_path = parquet_path.with_name(f".{parquet_path.name}.tmp")
+    try:
+        parquet_path.parent.mkdir(exist_ok=True)
+        df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        # The copy is only a cache: any failure (read-only directory, a column
+        # pyarrow cannot convert) leaves the CSV frame to be used as read
+        tmp_path.unlink(missing_ok=True)
+        logger.warning(f"Could not write Parquet copy of {csv_path.name}: {e}")
+    return df
+
+
+@dataclass
+class EntityArrays:
+    """Column arrays (structure-of-arrays) for one loaded table, used by the hot paths."""
+    ids: np.ndarray
+    names: np.ndarray
+    lats: np.ndarray
+    lons: np.ndarray
+    size_buckets: np.ndarray
+    addresses: np.ndarray  # address, city and postal code joined with ", "; "" if none
+    member_counts: np.ndarray
+    cities: np.ndarray
+    industries: np.ndarray
+    name_index: Dict
+    row_by_name: Dict[str, int]  # first row for each exact name
+    spatial_index: Optional[BallTree]  # haversine ball tree over rows with coordinates; None if there are none
+    spatial_rows: np.ndarray  # table row of each point in spatial_index
+
+
+# Name-similarity component weights, shared by the scalar and vectorized scorers
+TEXT_SIMILARITY_WEIGHTS = {'substring': 0.5, 'jaccard': 0.3, 'char': 0.2}
+
+# Fuzzy fallback: only for queries this long, and never below this similarity
+FUZZY_MIN_QUERY_LENGTH = 4
+FUZZY_MIN_SCORE = 0.5
+
+EARTH_RADIUS_KM = 6371.0  # same radius as golden_goal.ml.pipeline.haversine
+
+# Extra search-result columns per entity type
+RESULT_METADATA = {
+    'association': ['size_bucket', 'member_count', 'city'],
+    'company': ['industry', 'size_bucket'],
+}
+
+# Address columns tried in order, as found across the supported CSV layouts
+ADDRESS_FIELDS = ['address', 'Address', 'Adress', 'street_address', 'gatuadress']
+CITY_FIELDS = ['city', 'City', 'Postort', 'postort', 'stad']
+POSTAL_FIELDS = ['postal_code', 'postnummer', 'Postnummer', 'Post Nr', 'zip']
+
+
 class GoldenGoalService:
     """Main service class for sponsor search and recommendations."""
 
@@ -66,13 +141,24 @@ class GoldenGoalService:
 
     def _load_csv_data(self):
         """Load CSV data into memory if not already cached."""
-        global _data_cache
-
-        if 'associations' in _data_cache and 'companies' in _data_cache:
-            self.associations_df = _data_cache['associations']
-            self.companies_df = _data_cache['companies']
+        if self._use_cached_data():
             return
-
+        with _data_cache_lock:
+            # Another instance may have finished loading while we waited
+            if self._use_cached_data():
+                return
+            self._read_csv_data()
+
+    def _use_cached_data(self) -> bool:
+        """Attach the shared cached tables to this instance, if they have been loaded."""
+        cached = _data_cache.get('tables')
+        if cached is None:
+            return False
+        self.associations_df, self.companies_df, self._assoc_arrays, self._company_arrays = cached
+        return True
+
+    def _read_csv_data(self):
+        """Read the association and company CSVs and publish them to the shared cache."""
         # Find data directory
         project_root = Path(__file__).parent.parent.parent
         data_dir = project_root / "data"
@@ -90,7 +176,7 @@ class GoldenGoalService:
             filepath = data_dir / filename
             if filepath.exists():
                 try:
-                    self.associations_df = pd.read_csv(filepath)
+                    self.associations_df = _read_data_file(filepath)
 
                     # Check if this is associations_prepared.csv with correct structure
                     if filename == "associations_prepared.csv":
@@ -176,7 +262,7 @@ class GoldenGoalService:
             filepath = data_dir / filename
             if filepath.exists():
                 try:
-                    self.companies_df = pd.read_csv(filepath)
+                    self.companies_df = _read_data_file(filepath)
 
                     # Standardize column names
                     column_mapping = {
@@ -218,33 +304,206 @@ class GoldenGoalService:
                 except Exception as e:
                     logger.error(f"Failed to load {filename}: {e}")
 
-        # Cache the data
-        _data_cache['associations'] = self.associations_df
-        _data_cache['companies'] = self.companies_df
-
-    def _get_address_parts(self, row):
-        """Extract address parts from a dataframe row with multiple fallbacks."""
-        parts = []
-
-        # Try multiple possible address fields
-        for field in ['address', 'Address', 'Adress', 'street_address', 'gatuadress']:
-            if field in row and pd.notna(row[field]) and str(row[field]).strip():
-                parts.append(str(row[field]).strip())
-                break
-
-        # Add city/postal info
-        for field in ['city', 'City', 'Postort', 'postort', 'stad']:
-            if field in row and pd.notna(row[field]) and str(row[field]).strip():
-                parts.append(str(row[field]).strip())
-                break
+        # Cache the data; published as one tuple so readers never see a partial load
+        self._assoc_arrays = self._build_entity_arrays(self.associations_df)
+        self._company_arrays = self._build_entity_arrays(self.companies_df)
+        _data_cache['tables'] = (self.associations_df, self.companies_df, self._assoc_arrays, self._company_arrays)
+        _data_cache.pop('fuzzy', None)  # rebuilt from these tables on the next fallback search
+
+    @staticmethod
+    def _first_filled(df: pd.DataFrame, fields: List[str]) -> pd.Series:
+        """Per row, the stripped value of the first field in `fields` that is present and non-empty."""
+        out = pd.Series('', index=df.index, dtype=object)
+        for field in reversed(fields):
+            if field in df.columns:
+                values = df[field].map(str).str.strip()
+                out = values.where(df[field].notna() & (values != ''), out)
+        return out
+
+    @classmethod
+    def _build_entity_arrays(cls, df: Optional[pd.DataFrame]) -> EntityArrays:
+        """Extract the columns used by search/lookup into contiguous arrays, once per load."""
+        if df is None:
+            df = pd.DataFrame()
+
+        def column(names: List[str], default) -> pd.Series:
+            for name in names:
+                if name in df.columns:
+                    return df[name]
+            return pd.Series(default, index=df.index)
+
+        names = column(['name'], '').map(str).to_numpy(dtype=object)
+        lats = column(['lat', 'latitude'], 0).to_numpy(dtype=np.float64)
+        lons = column(['lon', 'longitude'], 0).to_numpy(dtype=np.float64)
+        located = np.flatnonzero((lats != 0) & (lons != 0) & np.isfinite(lats) & np.isfinite(lons))
+
+        address_parts = zip(
+            cls._first_filled(df, ADDRESS_FIELDS),
+            cls._first_filled(df, CITY_FIELDS),
+            cls._first_filled(df, POSTAL_FIELDS),
+        )
+        return EntityArrays(
+            ids=column(['id'], 0).to_numpy(dtype=np.int64),
+            names=names,
+            lats=lats,
+            lons=lons,
+            size_buckets=column(['size_bucket'], 'medium').map(str).to_numpy(dtype=object),
+            addresses=np.array([", ".join(p for p in parts if p) for parts in address_parts], dtype=object),
+            member_counts=pd.to_numeric(column(['member_count'], 0), errors='coerce')
+                .fillna(0).to_numpy(dtype=np.int64),
+            cities=column(['city'], '').map(str).to_numpy(dtype=object),
+            industries=column(['industry'], 'Other').map(str).to_numpy(dtype=object),
+            name_index=cls._build_name_index(df),
+            row_by_name=cls._first_row_by_name(names),
+            spatial_index=BallTree(np.radians(np.column_stack([lats[located], lons[located]])), metric='haversine')
+            if len(located) else None,
+            spatial_rows=located,
+        )
 
-        # Add postal code if available
-        for field in ['postal_code', 'postnummer', 'Postnummer', 'Post Nr', 'zip']:
-            if field in row and pd.notna(row[field]) and str(row[field]).strip():
-                parts.append(str(row[field]).strip())
-                break
+    @staticmethod
+    def _first_row_by_name(names: np.ndarray) -> Dict[str, int]:
+        """Map each name to the first row holding it, for O(1) exact lookups."""
+        unique_names, first_rows = np.unique(names, return_index=True)
+        return dict(zip(unique_names.tolist(), first_rows.tolist()))
+
+    @staticmethod
+    def _rows_within(arrays: EntityArrays, lat: float, lon: float, km: float) -> np.ndarray:
+        """Table rows whose coordinates lie within `km` of (lat, lon), in table order."""
+        if not len(arrays.spatial_rows):
+            return arrays.spatial_rows
+        # Ball-tree radius is in radians on the unit sphere; pad slightly so the
+        # exact haversine check in the caller decides the boundary
+        radius = km / EARTH_RADIUS_KM * (1 + 1e-9)
+        (hits,) = arrays.spatial_index.query_radius(np.radians([[lat, lon]]), r=radius)
+        return np.sort(arrays.spatial_rows[hits])
+
+    @staticmethod
+    def _build_name_index(df: Optional[pd.DataFrame]) -> Dict:
+        """
+        Precompute what the vectorized search scorer needs per name: lowercase names,
+        lengths, token and trigram inverted indexes and a row x character presence matrix.
+        """
+        if df is None or 'name' not in df.columns:
+            names = pd.Series([], dtype=object)
+        else:
+            names = df['name'].map(str).str.lower().str.strip()
+        tokens = names.str.split()
+
+        # Inverted index over whole tokens: sort unique (token, row) keys and split per token
+        exploded = tokens.explode().dropna()
+        stride = max(len(names), 1)
+        rows = names.index.get_indexer(exploded.index).astype(np.int64)
+        codes, vocabulary = pd.factorize(exploded.to_numpy())
+        keys = np.unique(codes.astype(np.int64) * stride + rows)
+        key_codes = keys // stride
+        starts = np.flatnonzero(np.diff(key_codes)) + 1
+        token_postings = {}
+        if len(keys):
+            token_postings = dict(zip(
+                vocabulary[key_codes[np.r_[0, starts]]],
+                np.split((keys % stride).astype(np.int32), starts),
+            ))
+
+        # Trigram index: (trigram key, row) pairs sorted by key. Names are joined with NUL
+        # separators and each trigram is packed from three 21-bit code points.
+        points = np.frombuffer('\0'.join(names).encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        owner = np.repeat(np.arange(len(names)), names.str.len().to_numpy(dtype=np.int64) + 1)[:len(points)]
+        trigram_keys = np.empty(0, dtype=np.int64)
+        trigram_rows = np.empty(0, dtype=np.int32)
+        if len(points) >= 3:
+            keys = (points[:-2] << 42) | (points[1:-1] << 21) | points[2:]
+            valid = (points[:-2] != 0) & (points[1:-1] != 0) & (points[2:] != 0) & (owner[:-2] == owner[2:])
+            keys, key_rows = keys[valid], owner[:-2][valid]
+            order = np.lexsort((key_rows, keys))
+            keys, key_rows = keys[order], key_rows[order]
+            distinct = np.r_[True, (np.diff(keys) != 0) | (np.diff(key_rows) != 0)]
+            trigram_keys, trigram_rows = keys[distinct], key_rows[distinct].astype(np.int32)
+
+        # Exact per-character presence (covers å/ä/ö, unlike an ASCII-only bitmap)
+        char_columns = {c: i for i, c in enumerate(sorted(set(''.join(names))))}
+        char_matrix = np.zeros((len(names), len(char_columns)), dtype=bool)
+        for char, col in char_columns.items():
+            char_matrix[:, col] = names.str.contains(char, regex=False).to_numpy(dtype=bool)
+
+        return {
+            'lower': names,
+            'len': names.str.len().to_numpy(dtype=np.float64),
+            'ntokens': tokens.str.len().to_numpy(dtype=np.float64),
+            'token_postings': token_postings,
+            'trigram_keys': trigram_keys,
+            'trigram_rows': trigram_rows,
+            'char_columns': char_columns,
+            'char_matrix': char_matrix,
+        }
+
+    @staticmethod
+    def _candidate_rows(query: str, index: Dict) -> np.ndarray:
+        """
+        Row positions that can score above zero on substring or token overlap.
+
+        For queries of 3+ characters a name must share a trigram with the query (substring,
+        or a shared token of 3+ characters) or share a whole token; any other name scores at
+        most 0.2 from character overlap alone, below the search threshold.
+        """
+        n_rows = len(index['lower'])
+        if len(query) < 3:
+            return np.arange(n_rows)
+
+        points = np.frombuffer(query.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        query_keys = np.unique((points[:-2] << 42) | (points[1:-1] << 21) | points[2:])
+        lo = np.searchsorted(index['trigram_keys'], query_keys, side='left')
+        hi = np.searchsorted(index['trigram_keys'], query_keys, side='right')
+        parts = [index['trigram_rows'][a:b] for a, b in zip(lo, hi) if b > a]
+        parts += [index['token_postings'][t] for t in set(query.split()) if t in index['token_postings']]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(parts)).astype(np.int64)
+
+    @staticmethod
+    def _score_names(query: str, index: Dict, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized equivalent of _calculate_text_similarity(query, name) for the names at
+        positions `rows` (all names if None). `query` must already be lowercased and stripped.
+        """
+        if rows is None:
+            rows = np.arange(len(index['lower']))
+        names = index['lower'].iloc[rows]
+        text_len = index['len'][rows]
+        if not query or names.empty:
+            return np.zeros(len(names))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Substring match score
+            contains = names.str.contains(query, regex=False).to_numpy(dtype=bool)
+            substring_score = np.where(contains, len(query) / text_len, 0.0)
+
+            # Jaccard token overlap from the posting lists of the query tokens
+            query_tokens = set(query.split())
+            intersection = np.zeros(len(index['lower']))
+            for token in query_tokens:
+                posting = index['token_postings'].get(token)
+                if posting is not None:
+                    intersection[posting] += 1
+            intersection = intersection[rows]
+            n_tokens = index['ntokens'][rows]
+            union = len(query_tokens) + n_tokens - intersection
+            jaccard_score = np.where(n_tokens > 0, intersection / union, 0.0)
+
+            # Character overlap, counting repeated query characters like the scalar version
+            known = [c for c in set(query) if c in index['char_columns']]
+            columns = [index['char_columns'][c] for c in known]
+            counts = np.array([query.count(c) for c in known], dtype=np.float64)
+            char_overlap = index['char_matrix'][np.ix_(rows, columns)] @ counts
+            char_score = char_overlap / np.maximum(len(query), text_len)
 
-        return parts
+        final_score = (
+                substring_score * TEXT_SIMILARITY_WEIGHTS['substring'] +
+                jaccard_score * TEXT_SIMILARITY_WEIGHTS['jaccard'] +
+                char_score * TEXT_SIMILARITY_WEIGHTS['char']
+        )
+        final_score = np.where(names.to_numpy() == query, 1.0, final_score)
+        final_score[text_len == 0] = 0.0
+        return np.clip(final_score, 0.0, 1.0)
 
     def search(self, query: str, limit: int = 100) -> pd.DataFrame:
         """Search associations and companies by name with fuzzy matching."""
@@ -252,70 +511,133 @@ class GoldenGoalService:
         if len(query_lower) < 2:
             return pd.DataFrame()
 
-        results = []
+        hits = []  # (type, arrays, rows, scores) per table
 
         # Search associations
         if hasattr(self, 'associations_df') and not self.associations_df.empty:
-            for _, assoc in self.associations_df.iterrows():
-                name_lower = str(assoc.get('name', '')).lower()
-                score = self._calculate_text_similarity(query_lower, name_lower)
-                if score > 0.3:
-                    # Get address using the new helper method
-                    addr_parts = self._get_address_parts(assoc)
-                    address_str = ", ".join(addr_parts) if addr_parts else "Address not available"
-
-                    results.append(SearchResult(
-                        id=int(assoc.get('id', 0)),
-                        name=str(assoc.get('name', '')),
-                        type='association',
-                        address=address_str,
-                        latitude=float(assoc.get('lat', assoc.get('latitude', 0))),
-                        longitude=float(assoc.get('lon', assoc.get('longitude', 0))),
-                        score=score,
-                        metadata={
-                            'size_bucket': str(assoc.get('size_bucket', 'medium')),
-                            'member_count': int(assoc.get('member_count', 0)),
-                            'city': str(assoc.get('city', ''))
-                        }
-                    ))
+            assoc = self._assoc_arrays
+            rows = self._candidate_rows(query_lower, assoc.name_index)
+            scores = self._score_names(query_lower, assoc.name_index, rows)
+            hits.append(('association', assoc, rows[scores > 0.3], scores[scores > 0.3]))
 
         # Search companies
         if hasattr(self, 'companies_df') and not self.companies_df.empty:
-            for _, comp in self.companies_df.iterrows():
-                name_lower = str(comp.get('name', '')).lower()
-                score = self._calculate_text_similarity(query_lower, name_lower)
-                if score > 0.3:
-                    results.append(SearchResult(
-                        id=int(comp.get('id', 0)),
-                        name=str(comp.get('name', '')),
-                        type='company',
-                        address=None,
-                        latitude=float(comp.get('lat', comp.get('latitude', 0))),
-                        longitude=float(comp.get('lon', comp.get('longitude', 0))),
-                        score=score,
-                        metadata={
-                            'industry': str(comp.get('industry', 'Other')),
-                            'size_bucket': str(comp.get('size_bucket', 'medium'))
-                        }
-                    ))
-
-        # Sort and return
-        results.sort(key=lambda x: x.score, reverse=True)
-        results = results[:limit]
-
-        # Convert to DataFrame and include all metadata fields
-        df = pd.DataFrame([{
-            'type': r.type,
-            'id': r.id,
-            'name': r.name,
-            'address': r.address,
-            'latitude': r.latitude,
-            'longitude': r.longitude,
-            'score': r.score,
-            'score_percentage': round(r.score * 100, 1),
-            **r.metadata
-        } for r in results])
-        return df
+            comp = self._company_arrays
+            rows = self._candidate_rows(query_lower, comp.name_index)
+            scores = self._score_names(query_lower, comp.name_index, rows)
+            hits.append(('company', comp, rows[scores > 0.3], scores[scores > 0.3]))
+
+        # Nothing matched literally (e.g. "hacken" for "Häcken"): fall back to n-gram similarity
+        if not any(len(h[2]) for h in hits):
+            hits = self._fuzzy_hits(query_lower, [(h[0], h[1]) for h in hits])
+
+        # Sort and return: one stable sort over both tables, ties keep associations first
+        all_scores = np.clip(np.concatenate([h[3] for h in hits] or [np.empty(0)]), 0.0, 1.0)
+        order = self._top_k(all_scores, limit)
+        if not len(order):
+            return pd.DataFrame()
+
+        frames = []
+        offset = 0
+        for entity_type, arrays, rows, _ in hits:
+            in_table = (order >= offset) & (order < offset + len(rows))
+            if in_table.any():
+                frames.append(self._result_frame(
+                    entity_type, arrays, rows[order[in_table] - offset],
+                    all_scores[order[in_table]], index=np.flatnonzero(in_table)
+                ))
+            offset += len(rows)
+        df = pd.concat(frames).sort_index().reset_index(drop=True)
+        if 'address' not in df:
+            df['address'] = None  # companies carry no address
+
+        # Metadata columns in order of first appearance among the ranked results
+        columns = ['type', 'id', 'name', 'address', 'latitude', 'longitude', 'score', 'score_percentage']
+        for entity_type in df['type'].unique():
+            columns += RESULT_METADATA[entity_type]
+        return df[list(dict.fromkeys(columns))]
+
+    def _fuzzy_index(self):
+        """
+        Accent-folded character n-gram TF-IDF matrix over association then company names.
+
+        Built on the first fallback search and shared through _data_cache; None
+        when there are no names to index.
+        """
+        if 'fuzzy' not in _data_cache:
+            with _fuzzy_index_lock:
+                if 'fuzzy' not in _data_cache:
+                    names = pd.concat([self._assoc_arrays.name_index['lower'],
+                                       self._company_arrays.name_index['lower']])
+                    vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 3),
+                                                 strip_accents='unicode', dtype=np.float32)
+                    try:
+                        fuzzy = (vectorizer, vectorizer.fit_transform(names))
+                    except ValueError:  # empty vocabulary: no usable names loaded
+                        fuzzy = None
+                    _data_cache['fuzzy'] = fuzzy
+        return _data_cache['fuzzy']
+
+    @staticmethod
+    def _fuzzy_cutoff(query: str) -> float:
+        """Minimum fuzzy similarity for `query`; shorter queries share n-grams by chance, so need more."""
+        return max(FUZZY_MIN_SCORE, 0.8 - 0.05 * len(query))
+
+    def _fuzzy_hits(self, query: str, tables: List) -> List:
+        """Rows above the fuzzy cutoff by TF-IDF cosine similarity, per (type, arrays) table."""
+        fuzzy = self._fuzzy_index() if len(query) >= FUZZY_MIN_QUERY_LENGTH else None
+        if fuzzy is None:
+            return [(entity_type, arrays, np.empty(0, dtype=np.intp), np.empty(0))
+                    for entity_type, arrays in tables]
+
+        vectorizer, matrix = fuzzy
+        similarity = (matrix @ vectorizer.transform([query]).T).toarray().ravel().astype(np.float64)
+        cutoff = self._fuzzy_cutoff(query)
+        offsets = {'association': 0, 'company': len(self._assoc_arrays.names)}
+        hits = []
+        for entity_type, arrays in tables:
+            scores = similarity[offsets[entity_type]:offsets[entity_type] + len(arrays.names)]
+            rows = np.flatnonzero(scores >= cutoff)
+            hits.append((entity_type, arrays, rows, scores[rows]))
+        return hits
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the `k` highest scores, best first; ties keep their original order."""
+        candidates = np.arange(len(scores))
+        if 0 < k < len(scores):
+            # O(N) partition to find the k-th best score, then sort only what can make the cut
+            kth = -np.partition(-scores, k - 1)[k - 1]
+            candidates = np.flatnonzero(scores >= kth)
+        return candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+
+    @staticmethod
+    def _result_frame(entity_type: str, arrays: EntityArrays, rows: np.ndarray,
+                      scores: np.ndarray, index: np.ndarray) -> pd.DataFrame:
+        """Build the search-result columns for the given rows of one table."""
+        columns = {
+            'type': entity_type,
+            'id': arrays.ids[rows],
+            'name': arrays.names[rows],
+            'latitude': arrays.lats[rows],
+            'longitude': arrays.lons[rows],
+            'score': scores,
+            'score_percentage': np.round(scores * 100, 1),
+        }
+        if entity_type == 'association':
+            addresses = arrays.addresses[rows]
+            columns['address'] = np.where(addresses != '', addresses, "Address not available")
+            columns.update(
+                size_bucket=arrays.size_buckets[rows],
+                member_count=arrays.member_counts[rows],
+                city=arrays.cities[rows],
+            )
+        else:
+            columns.update(
+                industry=arrays.industries[rows],
+                size_bucket=arrays.size_buckets[rows],
+            )
+        return pd.DataFrame(columns, index=index)
 
     def _calculate_text_similarity(self, query: str, text: str) -> float:
         """Calculate a similarity score between 0 and 1 for two text strings."""
@@ -343,38 +665,35 @@ class GoldenGoalService:
             jaccard_score = 0.0
 
         # Character overlap
-        char_overlap = sum(1 for c in query if c in text)
+        text_chars = set(text)
+        char_overlap = sum(1 for c in query if c in text_chars)
         char_score = char_overlap / max(len(query), len(text))
 
         # Combine with weights
-        weights = {'substring': 0.5, 'jaccard': 0.3, 'char': 0.2}
         final_score = (
-                substring_score * weights['substring'] +
-                jaccard_score * weights['jaccard'] +
-                char_score * weights['char']
+                substring_score * TEXT_SIMILARITY_WEIGHTS['substring'] +
+                jaccard_score * TEXT_SIMILARITY_WEIGHTS['jaccard'] +
+                char_score * TEXT_SIMILARITY_WEIGHTS['char']
         )
-        return np.clip(final_score, 0.0, 1.0)
+        # Each component is in [0, 1] and the weights sum to 1, so no clipping is needed
+        return float(final_score)
 
     def get_association_by_name(self, name: str) -> Optional[Dict]:
         """Find an association by exact name."""
         if not hasattr(self, 'associations_df') or self.associations_df.empty:
             return None
 
-        match = self.associations_df[self.associations_df['name'] == name]
-        if not match.empty:
-            assoc = match.iloc[0]
-            # Get address using the helper method
-            addr_parts = self._get_address_parts(assoc)
-            address_str = ", ".join(addr_parts) if addr_parts else ""
-
+        assoc = self._assoc_arrays
+        pos = assoc.row_by_name.get(name)
+        if pos is not None:
             return {
-                'id': int(assoc.get('id', 0)),
-                'name': str(assoc.get('name', '')),
-                'lat': float(assoc.get('lat', assoc.get('latitude', 0))),
-                'lon': float(assoc.get('lon', assoc.get('longitude', 0))),
-                'size_bucket': str(assoc.get('size_bucket', 'medium')),
-                'member_count': int(assoc.get('member_count', 0)),
-                'address': address_str
+                'id': int(assoc.ids[pos]),
+                'name': assoc.names[pos],
+                'lat': float(assoc.lats[pos]),
+                'lon': float(assoc.lons[pos]),
+                'size_bucket': assoc.size_buckets[pos],
+                'member_count': int(assoc.member_counts[pos]),
+                'address': assoc.addresses[pos]
             }
         return None
 
@@ -395,20 +714,17 @@ class GoldenGoalService:
                 return pd.DataFrame()
 
             df = pd.DataFrame(recommendations)
-            df['score_percentage'] = df['score'].apply(lambda x: round(np.clip(x, 0, 1) * 100, 1))
-
-            def get_match_quality(score):
-                if score >= 0.8:
-                    return 'Excellent'
-                elif score >= 0.6:
-                    return 'Good'
-                elif score >= 0.4:
-                    return 'Fair'
-                else:
-                    return 'Possible'
-
-            df['match_quality'] = df['score'].apply(get_match_quality)
-            df = df.sort_values('score', ascending=False).reset_index(drop=True)
+            scores = df['score'].to_numpy(dtype=np.float64)
+            df['score_percentage'] = np.round(np.clip(scores, 0, 1) * 100, 1)
+
+            # Lower bounds inclusive: 0.4 is Fair, 0.6 Good, 0.8 Excellent; anything else
+            # (NaN included) is Possible. Plain strings, not a Categorical
+            df['match_quality'] = np.select(
+                [scores >= 0.8, scores >= 0.6, scores >= 0.4],
+                ['Excellent', 'Good', 'Fair'],
+                default='Possible'
+            ).astype(object)
+            df = df.iloc[np.argsort(-scores, kind='stable')].reset_index(drop=True)
             return df
 
         except Exception as e:
@@ -421,7 +737,7 @@ class GoldenGoalService:
             return []
 
         from golden_goal.ml.pipeline import (
-            haversine, calculate_distance_score,
+            haversine_many, calculate_distance_score,
             calculate_size_match_score, calculate_industry_affinity
         )
 
@@ -430,16 +746,15 @@ class GoldenGoalService:
         assoc_size = association['size_bucket']
 
         recommendations = []
+        comp = self._company_arrays
 
-        for idx, company in self.companies_df.iterrows():
-            comp_lat = float(company.get('lat', company.get('latitude', 0)))
-            comp_lon = float(company.get('lon', company.get('longitude', 0)))
-
-            if comp_lat == 0 or comp_lon == 0:
-                continue
+        # Only companies inside the search radius are scored
+        rows = self._rows_within(comp, assoc_lat, assoc_lon, max_distance)
+        distances = haversine_many(assoc_lat, assoc_lon, comp.lats[rows], comp.lons[rows]).tolist()
+        for pos, distance_km in zip(rows, distances):
+            comp_lat = float(comp.lats[pos])
+            comp_lon = float(comp.lons[pos])
 
-            # Calculate distance
-            distance_km = haversine(assoc_lat, assoc_lon, comp_lat, comp_lon)
             if distance_km > max_distance:
                 continue
 
@@ -447,11 +762,11 @@ class GoldenGoalService:
             distance_score = calculate_distance_score(distance_km, max_distance)
             size_score = calculate_size_match_score(
                 assoc_size,
-                str(company.get('size_bucket', 'medium'))
+                comp.size_buckets[pos]
             )
             industry_score = calculate_industry_affinity(
-                str(company.get('industry', 'Other')),
-                str(company.get('name', ''))
+                comp.industries[pos],
+                comp.names[pos]
             )
 
             # Simple weighting without clustering
@@ -462,12 +777,12 @@ class GoldenGoalService:
             )
 
             # Get company name
-            company_name = str(company.get('name', ''))
-            if not company_name or company_name == 'nan' or pd.isna(company_name):
-                company_name = f"Company_{company.get('id', idx)}"
+            company_name = comp.names[pos]
+            if not company_name or company_name == 'nan':
+                company_name = f"Company_{comp.ids[pos]}"
 
             recommendations.append({
-                "id": int(company.get('id', 0)),
+                "id": int(comp.ids[pos]),
                 "name": company_name,
                 "lat": comp_lat,
                 "lon": comp_lon,
@@ -476,8 +791,8 @@ class GoldenGoalService:
                 "distance": round(distance_km, 2),
                 "distance_km": round(distance_km, 1),
                 "score": round(final_score, 4),
-                "size_bucket": str(company.get('size_bucket', 'medium')),
-                "industry": str(company.get('industry', 'Other')),
+                "size_bucket": comp.size_buckets[pos],
+                "industry": comp.industries[pos],
                 "display_name": company_name
             })
 
@@ -4,8 +4,6 @@
 #!/usr/bin/env python3
 """Generate realistic sample data for SponsorMatch AI."""
 
-# Standard library or third-party import
-import random
 # Standard library or third-party import
 from pathlib import Path
 
@@ -17,7 +15,6 @@ import pandas as pd
 from faker import Faker
 
 # Set seeds for reproducibility
-random.seed(42)
 np.random.seed(42)
 fake = Faker()
 Faker.seed(42)
@@ -26,7 +23,6 @@ Faker.seed(42)
 # Definition of function 'generate_sample_companies': explains purpose and parameters
 def generate_sample_companies(n=50):
     """Generate realistic Swedish companies."""
-    companies = []
 
     # Swedish company types and their characteristics
     industries = {
@@ -46,46 +42,46 @@ def generate_sample_companies(n=50):
         ('Linköping', 58.4108, 15.6214)
     ]
 
-    for i in range(n):
-        industry = random.choice(list(industries.keys()))
-        city, base_lat, base_lon = random.choice(cities)
-
-        # Add some randomness to coordinates
-        lat = base_lat + random.uniform(-0.1, 0.1)
-        lon = base_lon + random.uniform(-0.1, 0.1)
-
-        revenue = random.randint(*industries[industry]['revenue_range'])
-        employees = random.randint(*industries[industry]['employee_range'])
-
-        # Determine size bucket
-        if revenue < 50000:
-            size_bucket = 'small'
-        elif revenue < 250000:
-            size_bucket = 'medium'
-        else:
-            size_bucket = 'large'
-
-        company = {
-            'id': i + 1,
-            'orgnr': f"{random.randint(100000, 999999)}-{random.randint(1000, 9999)}",
-            'name': f"{fake.company()} {random.choice(['AB', 'Ltd', 'Group'])}",
-            'revenue_ksek': revenue,
-            'employees': employees,
-            'year': random.randint(2020, 2024),
-            'size_bucket': size_bucket,
-            'industry': industry,
-            'lat': round(lat, 6),
-            'lon': round(lon, 6)
-        }
-        companies.append(company)
-
-    return pd.DataFrame(companies)
+    # Draw every numeric column in bulk; only the Faker names are built per row
+    names = list(industries.keys())
+    industry_idx = np.random.randint(len(names), size=n)
+    city_idx = np.random.randint(len(cities), size=n)
+    revenue_low, revenue_high = np.array([industries[k]['revenue_range'] for k in names]).T
+    employee_low, employee_high = np.array([industries[k]['employee_range'] for k in names]).T
+
+    # Add some randomness to coordinates
+    lat = np.array([c[1] for c in cities])[city_idx] + np.random.uniform(-0.1, 0.1, size=n)
+    lon = np.array([c[2] for c in cities])[city_idx] + np.random.uniform(-0.1, 0.1, size=n)
+
+    revenue = np.random.randint(revenue_low[industry_idx], revenue_high[industry_idx] + 1)
+    employees = np.random.randint(employee_low[industry_idx], employee_high[industry_idx] + 1)
+
+    # Size bucket: small < 50 000, medium < 250 000, large otherwise
+    size_bucket = np.array(['small', 'medium', 'large'])[np.searchsorted([50000, 250000], revenue, side='right')]
+
+    orgnr_head = np.random.randint(100000, 1000000, size=n)
+    orgnr_tail = np.random.randint(1000, 10000, size=n)
+    company_suffix = np.random.choice(['AB', 'Ltd', 'Group'], size=n)
+
+    companies = pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'orgnr': [f"{head}-{tail}" for head, tail in zip(orgnr_head, orgnr_tail)],
+        'name': [f"{fake.company()} {suffix}" for suffix in company_suffix],
+        'revenue_ksek': revenue,
+        'employees': employees,
+        'year': np.random.randint(2020, 2025, size=n),
+        'size_bucket': size_bucket,
+        'industry': np.array(names)[industry_idx],
+        'lat': np.round(lat, 6),
+        'lon': np.round(lon, 6)
+    })
+
+    return companies
 
 
 # Definition of function 'generate_sample_associations': explains purpose and parameters
 def generate_sample_associations(n=30):
     """Generate realistic Swedish sports associations."""
-    associations = []
 
     sports = ['Fotboll', 'Ishockey', 'Bandy', 'Handboll', 'Basket', 'Innebandy']
     cities = [
@@ -96,36 +92,30 @@ def generate_sample_associations(n=30):
         ('Kungälv', 57.8700, 11.9800)
     ]
 
-    for i in range(n):
-        sport = random.choice(sports)
-        city, base_lat, base_lon = random.choice(cities)
-
-        lat = base_lat + random.uniform(-0.05, 0.05)
-        lon = base_lon + random.uniform(-0.05, 0.05)
-
-        members = random.randint(50, 800)
-
-        # Size bucket based on members
-        if members < 150:
-            size_bucket = 'small'
-        elif members < 400:
-            size_bucket = 'medium'
-        else:
-            size_bucket = 'large'
-
-        association = {
-            'id': i + 1,
-            'name': f"{city} {sport}klub",
-            'member_count': members,
-            'address': f"{fake.street_address()}, {city}",
-            'lat': round(lat, 6),
-            'lon': round(lon, 6),
-            'size_bucket': size_bucket,
-            'founded_year': random.randint(1950, 2020)
-        }
-        associations.append(association)
-
-    return pd.DataFrame(associations)
+    sport = np.random.choice(sports, size=n)
+    city_idx = np.random.randint(len(cities), size=n)
+    city = np.array([c[0] for c in cities])[city_idx]
+
+    lat = np.array([c[1] for c in cities])[city_idx] + np.random.uniform(-0.05, 0.05, size=n)
+    lon = np.array([c[2] for c in cities])[city_idx] + np.random.uniform(-0.05, 0.05, size=n)
+
+    members = np.random.randint(50, 801, size=n)
+
+    # Size bucket based on members: small < 150, medium < 400, large otherwise
+    size_bucket = np.array(['small', 'medium', 'large'])[np.searchsorted([150, 400], members, side='right')]
+
+    associations = pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'name': [f"{c} {s}klub" for c, s in zip(city, sport)],
+        'member_count': members,
+        'address': [f"{fake.street_address()}, {c}" for c in city],
+        'lat': np.round(lat, 6),
+        'lon': np.round(lon, 6),
+        'size_bucket': size_bucket,
+        'founded_year': np.random.randint(1950, 2021, size=n)
+    })
+
+    return associations
 
 
 # Definition of function 'main': explains purpose and parameters
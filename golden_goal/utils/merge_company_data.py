@@ -3,6 +3,7 @@
 merge_company_data.py - Improved version with better encoding handling
 """
 
+import codecs
 import pandas as pd
 from pathlib import Path
 import logging
@@ -11,6 +12,46 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _sniff_encoding(path: Path, encodings, sample_bytes: int = 1 << 20):
+    """
+    Return the first encoding that decodes the head of `path` without mojibake.
+
+    Only a sample is decoded, so the full file is normally parsed just once
+    instead of once per candidate encoding.
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    for encoding in encodings:
+        try:
+            # Incremental decode so a multi-byte character cut at the sample end isn't an error
+            text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        if 'Ã' not in text and '�' not in text:
+            return encoding
+    return None
+
+
+def _stripped(df: pd.DataFrame, column: str) -> pd.Series:
+    """Column as stripped strings, with missing values (or a missing column) as ''."""
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[column]
+    return values.where(values.notna(), '').map(str).str.strip()
+
+
+def build_full_address(df: pd.DataFrame) -> pd.Series:
+    """Join street_address, postal_code and city into one address per row (None if all are empty)."""
+    street = _stripped(df, 'street_address')
+    postal = _stripped(df, 'postal_code')
+    city = _stripped(df, 'city')
+
+    # "postal city" when both exist, otherwise whichever one does
+    locality = (postal + ' ' + city).where((postal != '') & (city != ''), postal + city)
+    full = (street + ', ' + locality).where((street != '') & (locality != ''), street + locality)
+    return full.where(full != '', None)
+
+
 def merge_company_data(data_dir: Path):
     """Merge all company data files with improved encoding and matching."""
 
@@ -18,16 +59,26 @@ def merge_company_data(data_dir: Path):
     logger.info("Loading SCB bulk file...")
     scb_file = data_dir / "scb_bulkfil_JE_20250512T094258_21.txt"
 
+    # Only these SCB columns are used; the rest of the wide bulk file is never parsed
+    scb_columns = ['PeOrgNr', 'Foretagsnamn', 'Gatuadress', 'PostNr', 'PostOrt', 'COAdress']
+
     # Try different encodings for Swedish data
     encodings_to_try = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'windows-1252']
     scb_df = None
 
+    # Try the sniffed encoding first; the others remain as fallbacks
+    sniffed = _sniff_encoding(scb_file, encodings_to_try)
+    if sniffed is not None:
+        encodings_to_try.remove(sniffed)
+        encodings_to_try.insert(0, sniffed)
+
     for encoding in encodings_to_try:
         try:
             scb_df = pd.read_csv(
                 scb_file,
                 sep='\t',
                 encoding=encoding,
+                usecols=lambda col: col in scb_columns,
                 low_memory=False
             )
             # Check if Swedish characters look correct
@@ -43,8 +94,7 @@ def merge_company_data(data_dir: Path):
         logger.error("Could not load SCB file with any encoding")
         return None
 
-    # Select relevant columns from SCB file
-    scb_columns = ['PeOrgNr', 'Foretagsnamn', 'Gatuadress', 'PostNr', 'PostOrt', 'COAdress']
+    # Select relevant columns from SCB file (in this order)
     available_columns = [col for col in scb_columns if col in scb_df.columns]
     scb_df = scb_df[available_columns].copy()
 
@@ -113,7 +163,7 @@ def merge_company_data(data_dir: Path):
     address_file = data_dir / "gothenburg_companies_addresses.csv"
     if address_file.exists():
         logger.info("Loading additional address data...")
-        address_df = pd.read_csv(address_file)
+        address_df = pd.read_csv(address_file, usecols=lambda col: col in ('PeOrgNr', 'registered_address'))
         if 'PeOrgNr' in address_df.columns:
             address_df['PeOrgNr'] = address_df['PeOrgNr'].astype(str).str.strip()
 
@@ -129,23 +179,8 @@ def merge_company_data(data_dir: Path):
     if 'latitude' in merged_df.columns:
         merged_df.rename(columns={'latitude': 'lat', 'longitude': 'lon'}, inplace=True)
 
-    # Create a clean address field
-    def create_full_address(row):
-        parts = []
-        if pd.notna(row.get('street_address')) and str(row['street_address']).strip():
-            parts.append(str(row['street_address']).strip())
-        if pd.notna(row.get('postal_code')) and str(row['postal_code']).strip():
-            postal = str(row['postal_code']).strip()
-            if pd.notna(row.get('city')) and str(row['city']).strip():
-                parts.append(f"{postal} {row['city'].strip()}")
-            else:
-                parts.append(postal)
-        elif pd.notna(row.get('city')) and str(row['city']).strip():
-            parts.append(str(row['city']).strip())
-
-        return ', '.join(parts) if parts else None
-
-    merged_df['full_address'] = merged_df.apply(create_full_address, axis=1)
+    # Create a clean address field: "street, postal city" from whichever parts are present
+    merged_df['full_address'] = build_full_address(merged_df)
 
     # Add industry information (if not present)
     if 'industry' not in merged_df.columns:
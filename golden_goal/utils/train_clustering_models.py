@@ -3,17 +3,18 @@
 train_clustering_models.py - Train clustering models with consistent features
 """
 
+import hashlib
 import logging
+import os
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 from sqlalchemy import text
 from golden_goal.core.db import get_engine
+from golden_goal.ml.pipeline import fit_location_clusters, save_model
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 MODELS_DIR = PROJECT_ROOT / "golden_goal" / "models"
 MODELS_DIR.mkdir(exist_ok=True)
+TRAINING_CACHE_DIR = PROJECT_ROOT / "data" / "training_cache"
 
 # Feature configuration
 FEATURES = ['lat', 'lon']  # Use only lat/lon for consistent features
@@ -29,13 +31,85 @@ N_CLUSTERS = {
     'default': 5,
     'large': 3
 }
+SIZE_BUCKETS = ('small', 'medium', 'large')
+
+
+def _patch_sklearn():
+    """
+    Route sklearn's KMeans to Intel's oneDAL kernels when sklearnex is installed.
+
+    On by default; set USE_SKLEARNEX=0 to train with stock sklearn. Without
+    sklearnex this falls back to stock sklearn, warning only if it was asked for
+    explicitly.
+    """
+    flag = os.getenv("USE_SKLEARNEX")
+    if (flag or "1") != "1":
+        return
+    try:
+        from sklearnex import patch_sklearn
+    except ImportError:
+        log = logger.warning if flag == "1" else logger.info
+        log("scikit-learn-intelex is not installed; using stock sklearn")
+        return
+    patch_sklearn()
+
+
+def _data_fingerprint(conn) -> str:
+    """
+    Cheap digest of both tables' contents: row count, max id, coordinate sums and,
+    per size bucket, the row count and id sum (the models are split by bucket, so a
+    re-bucketing with unchanged ids and coordinates must change the key too).
+    """
+    bucket_columns = ", ".join(
+        f"SUM(CASE WHEN size_bucket = '{b}' THEN 1 ELSE 0 END), "
+        f"SUM(CASE WHEN size_bucket = '{b}' THEN id ELSE 0 END)"
+        for b in SIZE_BUCKETS
+    )
+    parts = []
+    for table in ("associations", "companies"):
+        row = conn.execute(text(f"""
+                                SELECT COUNT(*), MAX(id), SUM(lat), SUM(lon), {bucket_columns}
+                                FROM {table}
+                                WHERE lat IS NOT NULL
+                                  AND lon IS NOT NULL
+                                """)).fetchone()
+        parts.append(f"{table}:{tuple(row)}")
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+
+
+def _prune_training_cache(key: str):
+    """Delete cached tables from earlier fingerprints; only the current pair is ever read."""
+    for path in TRAINING_CACHE_DIR.glob("*.parquet"):
+        if not path.stem.endswith(f"_{key}"):
+            path.unlink(missing_ok=True)
+
+
+def _write_parquet(df, path: Path):
+    """Write `df` to `path` via a temporary file so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    df.to_parquet(tmp, compression="zstd", index=False)
+    os.replace(tmp, path)
 
 
 def load_data():
-    """Load associations and companies from database."""
+    """
+    Load associations and companies from database.
+
+    The result is cached as Parquet under data/training_cache, keyed by a
+    fingerprint of the tables, so retraining on unchanged data skips the full
+    table reads.
+    """
     engine = get_engine()
 
     with engine.connect() as conn:
+        key = _data_fingerprint(conn)
+        assoc_cache = TRAINING_CACHE_DIR / f"associations_{key}.parquet"
+        comp_cache = TRAINING_CACHE_DIR / f"companies_{key}.parquet"
+        if assoc_cache.exists() and comp_cache.exists():
+            logger.info(f"Using cached training data ({key})")
+            return (pd.read_parquet(assoc_cache, engine='pyarrow', memory_map=True),
+                    pd.read_parquet(comp_cache, engine='pyarrow', memory_map=True))
+
         # Load associations
         associations = pd.read_sql(text("""
                                         SELECT id, name, lat, lon, size_bucket, member_count
@@ -52,6 +126,10 @@ def load_data():
                                        AND lon IS NOT NULL
                                      """), conn)
 
+    TRAINING_CACHE_DIR.mkdir(exist_ok=True, parents=True)
+    _write_parquet(associations, assoc_cache)
+    _write_parquet(companies, comp_cache)
+    _prune_training_cache(key)
     return associations, companies
 
 
@@ -60,13 +138,8 @@ def train_clustering_model(data, n_clusters, model_name):
     # Extract features
     X = data[FEATURES].values
 
-    # Scale features
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    # Train KMeans
-    kmeans = KMeans(n_clusters=min(n_clusters, len(data)), random_state=42)
-    kmeans.fit(X_scaled)
+    # Scale features and train KMeans (once per distinct location)
+    scaler, kmeans = fit_location_clusters(X, n_clusters)
 
     # Create model package with scaler
     model_package = {
@@ -78,11 +151,11 @@ def train_clustering_model(data, n_clusters, model_name):
 
     # Save model
     model_path = MODELS_DIR / f"{model_name}.joblib"
-    joblib.dump(model_package, model_path)
+    save_model(model_package, model_path)
     logger.info(f"Saved {model_name} model to {model_path}")
 
     # Report cluster sizes
-    labels = kmeans.labels_
+    labels = kmeans.predict(scaler.transform(X).astype(np.float32))
     unique, counts = np.unique(labels, return_counts=True)
     for label, count in zip(unique, counts):
         logger.info(f"  Cluster {label}: {count} items")
@@ -130,8 +203,8 @@ def create_backward_compatible_models():
     large_package = joblib.load(MODELS_DIR / "kmeans_large.joblib")
 
     # Extract just the KMeans models
-    joblib.dump(default_package['kmeans'], MODELS_DIR / "kmeans_simple.joblib")
-    joblib.dump(large_package['kmeans'], MODELS_DIR / "kmeans_large_simple.joblib")
+    save_model(default_package['kmeans'], MODELS_DIR / "kmeans_simple.joblib")
+    save_model(large_package['kmeans'], MODELS_DIR / "kmeans_large_simple.joblib")
 
     logger.info("Created backward compatible models")
 
@@ -157,11 +230,12 @@ def test_models():
 
     logger.info("\nTesting model predictions:")
     for point in test_points:
-        scaled_point = scaler.transform([point])
+        scaled_point = scaler.transform([point]).astype(kmeans.cluster_centers_.dtype)
         cluster = kmeans.predict(scaled_point)[0]
         logger.info(f"  Point {point} -> Cluster {cluster}")
 
 
 if __name__ == "__main__":
+    _patch_sklearn()
     train_all_models()
     test_models()
@@ -3,36 +3,75 @@
 load_full_data.py - Load the complete datasets into the database
 """
 
+import argparse
 import logging
 import pandas as pd
 from pathlib import Path
 from sqlalchemy import text
 import numpy as np
 
-from golden_goal.core.db import get_engine
+from golden_goal.core.db import get_engine, get_infile_engine
 from golden_goal.models.entities import Base
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# CSV header -> table column, as renamed by the pandas loaders below
+BULK_COLUMN_MAP = {
+    'associations': {'Adress': 'address', 'latitude': 'lat', 'longitude': 'lon'},
+    'companies': {'PeOrgNr': 'orgnr', 'latitude': 'lat', 'longitude': 'lon'},
+}
+
+# Common spellings of each size bucket; anything else is treated as 'medium'
+SIZE_BUCKET_ALIASES = {
+    'small': 'small', 's': 'small',
+    'medium': 'medium', 'm': 'medium', 'mellan': 'medium',
+    'large': 'large', 'l': 'large', 'stor': 'large',
+}
+
+# Defaults for columns the prepared CSVs may lack, shared by the pandas and bulk loaders
+MEMBERS_BY_SIZE = {'small': 200, 'medium': 600, 'large': 1000}  # 0-399, 400-799, 800+
+DEFAULT_MEMBER_COUNT = 500
+DEFAULT_FOUNDED_YEAR = 2000
+REVENUE_BY_SIZE = {'small': 15000, 'medium': 50000, 'large': 200000}
+DEFAULT_REVENUE = 30000
+EMPLOYEES_BY_SIZE = {'small': 25, 'medium': 100, 'large': 500}
+DEFAULT_EMPLOYEES = 50
+DEFAULT_COMPANY_YEAR = 2023
+DEFAULT_COMPANY_NAME = 'Unknown Company'
+INDUSTRIES = ['Technology', 'Finance', 'Manufacturing', 'Retail', 'Healthcare', 'Services', 'Other']
+
+
+def _sql_literal(value):
+    """Render a str or number as a SQL literal."""
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+def _sql_case(expr, mapping, default):
+    """SQL CASE mapping the values of `expr` through `mapping`, else `default`."""
+    whens = " ".join(f"WHEN {_sql_literal(k)} THEN {_sql_literal(v)}" for k, v in mapping.items())
+    return f"CASE {expr} {whens} ELSE {_sql_literal(default)} END"
+
+
+# SQL equivalent of clean_size_bucket(), applied to the raw CSV value
+SIZE_BUCKET_SQL = _sql_case("LOWER(TRIM(@size_bucket))", SIZE_BUCKET_ALIASES, 'medium')
+
 
 def clean_size_bucket(value):
     """Clean and validate size_bucket values."""
     if pd.isna(value) or value is None or value == '':
         return 'medium'  # Default value
 
-    value_str = str(value).lower().strip()
+    # Map common variations, defaulting to medium for any unknown values
+    return SIZE_BUCKET_ALIASES.get(str(value).lower().strip(), 'medium')
 
-    # Map common variations
-    if value_str in ['small', 's']:
-        return 'small'
-    elif value_str in ['medium', 'm', 'mellan']:
-        return 'medium'
-    elif value_str in ['large', 'l', 'stor']:
-        return 'large'
-    else:
-        # Default to medium for any unknown values
-        return 'medium'
+
+def clean_size_buckets(values: pd.Series) -> pd.Series:
+    """Vectorised clean_size_bucket over a whole column."""
+    normalised = values.map(str).str.lower().str.strip()
+    return normalised.map(SIZE_BUCKET_ALIASES).fillna('medium').where(values.notna(), 'medium')
 
 
 def load_full_associations(engine):
@@ -59,7 +98,7 @@ def load_full_associations(engine):
     logger.info(f"Loading associations from {associations_file}")
 
     # Read the CSV
-    df = pd.read_csv(associations_file)
+    df = pd.read_csv(associations_file, engine='pyarrow')
     logger.info(f"Loaded {len(df)} associations from CSV")
 
     # Rename columns to match database schema
@@ -70,7 +109,7 @@ def load_full_associations(engine):
     })
 
     # Clean size_bucket values
-    df['size_bucket'] = df['size_bucket'].apply(clean_size_bucket)
+    df['size_bucket'] = clean_size_buckets(df['size_bucket'])
 
     # Ensure required columns exist
     required_cols = ['id', 'name', 'lat', 'lon', 'size_bucket']
@@ -81,16 +120,11 @@ def load_full_associations(engine):
 
     # Add member_count based on size_bucket if not present
     if 'member_count' not in df.columns:
-        size_to_members = {
-            'small': 200,  # 0-399
-            'medium': 600,  # 400-799
-            'large': 1000  # 800+
-        }
-        df['member_count'] = df['size_bucket'].map(size_to_members).fillna(500)
+        df['member_count'] = df['size_bucket'].map(MEMBERS_BY_SIZE).fillna(DEFAULT_MEMBER_COUNT)
 
     # Add founded_year if not present
     if 'founded_year' not in df.columns:
-        df['founded_year'] = 2000  # Default value
+        df['founded_year'] = DEFAULT_FOUNDED_YEAR
 
     # Select only the columns we need
     cols_to_keep = ['id', 'name', 'address', 'lat', 'lon', 'size_bucket', 'member_count', 'founded_year']
@@ -105,7 +139,7 @@ def load_full_associations(engine):
         conn.execute(text("DELETE FROM associations"))
 
         # Insert new data
-        df.to_sql('associations', conn, if_exists='append', index=False)
+        df.to_sql('associations', conn, if_exists='append', index=False, chunksize=10_000)
 
     logger.info(f"Successfully loaded {len(df)} associations into database")
     return True
@@ -139,14 +173,18 @@ def load_full_companies(engine):
     total_loaded = 0
     failed_chunks = []
 
-    # First, clear existing data
+    # First, clear existing data. The chunks below commit one by one anyway, so
+    # on MySQL TRUNCATE (no per-row undo log) loses nothing over DELETE.
     with engine.begin() as conn:
-        conn.execute(text("DELETE FROM companies"))
+        if engine.dialect.name == 'mysql':
+            conn.execute(text("TRUNCATE TABLE companies"))
+        else:
+            conn.execute(text("DELETE FROM companies"))
 
     # Process in chunks
     for chunk_num, chunk in enumerate(pd.read_csv(companies_file, chunksize=chunk_size)):
         try:
-            logger.info(f"Processing chunk {chunk_num + 1} ({len(chunk)} companies)")
+            logger.debug(f"Processing chunk {chunk_num + 1} ({len(chunk)} companies)")
 
             # Rename columns to match database schema
             chunk = chunk.rename(columns={
@@ -156,7 +194,7 @@ def load_full_companies(engine):
             })
 
             # Clean size_bucket values - CRITICAL FIX
-            chunk['size_bucket'] = chunk['size_bucket'].apply(clean_size_bucket)
+            chunk['size_bucket'] = clean_size_buckets(chunk['size_bucket'])
 
             # Ensure orgnr is string and limited to 10 characters
             if 'orgnr' in chunk.columns:
@@ -166,41 +204,30 @@ def load_full_companies(engine):
 
             # Ensure name is not null
             if 'name' in chunk.columns:
-                chunk['name'] = chunk['name'].fillna('Unknown Company')
+                chunk['name'] = chunk['name'].fillna(DEFAULT_COMPANY_NAME)
 
             # Add missing columns with default values
             if 'revenue_ksek' not in chunk.columns:
                 # Assign revenue based on size_bucket
-                size_to_revenue = {
-                    'small': 15000,
-                    'medium': 50000,
-                    'large': 200000
-                }
-                chunk['revenue_ksek'] = chunk['size_bucket'].map(size_to_revenue).fillna(30000)
+                chunk['revenue_ksek'] = chunk['size_bucket'].map(REVENUE_BY_SIZE).fillna(DEFAULT_REVENUE)
 
             if 'employees' not in chunk.columns:
                 # Assign employees based on size_bucket
-                size_to_employees = {
-                    'small': 25,
-                    'medium': 100,
-                    'large': 500
-                }
-                chunk['employees'] = chunk['size_bucket'].map(size_to_employees).fillna(50)
+                chunk['employees'] = chunk['size_bucket'].map(EMPLOYEES_BY_SIZE).fillna(DEFAULT_EMPLOYEES)
 
             if 'year' not in chunk.columns:
-                chunk['year'] = 2023
+                chunk['year'] = DEFAULT_COMPANY_YEAR
 
             if 'industry' not in chunk.columns:
                 # Assign industries based on district or random
-                industries = ['Technology', 'Finance', 'Manufacturing', 'Retail', 'Healthcare', 'Services', 'Other']
                 if 'district' in chunk.columns:
                     # Use district to vary industries
                     chunk['industry'] = chunk.apply(
-                        lambda row: industries[hash(str(row.get('district', ''))) % len(industries)],
+                        lambda row: INDUSTRIES[hash(str(row.get('district', ''))) % len(INDUSTRIES)],
                         axis=1
                     )
                 else:
-                    chunk['industry'] = pd.Series([industries[i % len(industries)] for i in range(len(chunk))])
+                    chunk['industry'] = pd.Series([INDUSTRIES[i % len(INDUSTRIES)] for i in range(len(chunk))])
 
             # Select only the columns we need
             cols_to_keep = ['id', 'orgnr', 'name', 'revenue_ksek', 'employees', 'year',
@@ -234,6 +261,102 @@ def load_full_companies(engine):
     return total_loaded > 0
 
 
+def _bulk_defaults(table, present):
+    """SET assignments filling the columns the pandas loaders default when the CSV lacks them."""
+    def by_size(values):
+        # Map the raw CSV spelling straight to the value for its cleaned bucket
+        if 'size_bucket' not in present:
+            return _sql_literal(values['medium'])
+        aliases = {alias: values[bucket] for alias, bucket in SIZE_BUCKET_ALIASES.items()}
+        return _sql_case("LOWER(TRIM(@size_bucket))", aliases, values['medium'])
+
+    defaults = {'size_bucket': _sql_literal('medium')}
+    if table == 'associations':
+        defaults['member_count'] = by_size(MEMBERS_BY_SIZE)
+        defaults['founded_year'] = _sql_literal(DEFAULT_FOUNDED_YEAR)
+    elif table == 'companies':
+        defaults['revenue_ksek'] = by_size(REVENUE_BY_SIZE)
+        defaults['employees'] = by_size(EMPLOYEES_BY_SIZE)
+        defaults['year'] = _sql_literal(DEFAULT_COMPANY_YEAR)
+        # A stable hash of the district (or the name) picks the industry, like the pandas loader.
+        # MOD() rather than %, which the driver would read as a parameter marker
+        key = '@district' if 'district' in present else '@name'
+        industries = ", ".join(_sql_literal(i) for i in INDUSTRIES)
+        defaults['industry'] = f"ELT(1 + MOD(CRC32(COALESCE({key}, '')), {len(INDUSTRIES)}), {industries})"
+    return [f"`{col}` = {expr}" for col, expr in defaults.items() if col not in present]
+
+
+def bulk_load(engine, table, csv_path):
+    """
+    Load a prepared CSV straight into `table` with LOAD DATA LOCAL INFILE.
+
+    Much faster than the row-wise to_sql path for the full datasets, and loads
+    the same rows: empty fields become NULL, size buckets are cleaned, and
+    missing columns get the pandas loaders' defaults. Needs local_infile enabled
+    on the server; the client side is enabled only on the separate connection
+    from get_infile_engine. Columns the table does not have are skipped, and
+    rows without coordinates are removed afterwards.
+    """
+    csv_path = Path(csv_path)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    rename = BULK_COLUMN_MAP.get(table, {})
+    table_cols = set(Base.metadata.tables[table].columns.keys())
+    present = {rename.get(col, col) for col in header}
+
+    targets, assignments = [], []
+    for col in header:
+        name = rename.get(col, col)
+        if name == 'district' and table == 'companies':
+            targets.append('@district')  # only feeds the derived industry
+            continue
+        if name not in table_cols:
+            targets.append('@dummy')
+            continue
+        # Read every field into a variable so empty fields become NULL, as in pandas
+        targets.append(f'@{name}')
+        if name == 'size_bucket':
+            value = SIZE_BUCKET_SQL
+        elif name == 'orgnr':
+            value = "LEFT(NULLIF(@orgnr, ''), 10)"
+        elif name == 'name' and table == 'companies':
+            value = f"COALESCE(NULLIF(@name, ''), {_sql_literal(DEFAULT_COMPANY_NAME)})"
+        else:
+            value = f"NULLIF(@{name}, '')"
+        assignments.append(f"`{name}` = {value}")
+    assignments += _bulk_defaults(table, present)
+
+    # ESCAPED BY '' reads backslashes literally, as pandas and ingest_associations do
+    sql = (f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+           "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+           "LINES TERMINATED BY '\\n' IGNORE 1 LINES "
+           f"({', '.join(targets)}) SET {', '.join(assignments)}")
+
+    logger.info(f"Bulk loading {csv_path} into {table}")
+    # A fresh unpooled connection, so the relaxed session settings die with it;
+    # begin() keeps the whole load in one transaction (autocommit off)
+    infile_engine = get_infile_engine(engine)
+    try:
+        with infile_engine.begin() as conn:
+            conn.exec_driver_sql("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+            conn.execute(text(f"DELETE FROM {table}"))
+            loaded = conn.exec_driver_sql(sql, (str(csv_path.resolve()),)).rowcount
+            conn.execute(text(f"DELETE FROM {table} WHERE lat IS NULL OR lon IS NULL"))
+    finally:
+        infile_engine.dispose()
+
+    logger.info(f"Bulk loaded {loaded} rows into {table}")
+    return loaded > 0
+
+
+def parse_bulk_load(value):
+    """Parse a --bulk-load TABLE=PATH argument."""
+    table, sep, path = value.partition('=')
+    if not sep or table not in BULK_COLUMN_MAP:
+        raise argparse.ArgumentTypeError(
+            f"expected TABLE=PATH with TABLE one of {', '.join(BULK_COLUMN_MAP)}")
+    return table, Path(path)
+
+
 def verify_data(engine):
     """Verify the loaded data."""
     with engine.connect() as conn:
@@ -294,6 +417,12 @@ def verify_data(engine):
 
 def main():
     """Load full datasets into the database."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bulk-load', metavar='TABLE=PATH', type=parse_bulk_load, action='append',
+                        default=[], help="Load a CSV with LOAD DATA LOCAL INFILE, e.g. "
+                                         "associations=data/associations_prepared.csv (repeatable)")
+    args = parser.parse_args()
+
     logger.info("Loading full datasets into SponsorMatch AI database...")
 
     engine = get_engine()
@@ -301,6 +430,14 @@ def main():
     # Create tables if they don't exist
     Base.metadata.create_all(bind=engine)
 
+    if args.bulk_load:
+        for table, csv_path in args.bulk_load:
+            if not bulk_load(engine, table, csv_path):
+                logger.error(f"Failed to bulk load {table}")
+                return
+        verify_data(engine)
+        return
+
     # Load associations
     if not load_full_associations(engine):
         logger.error("Failed to load associations")
@@ -7,57 +7,77 @@ from sqlalchemy import text
 from golden_goal.core.db import get_engine
 
 
+# Secondary indexes per table: (index name, column list)
+INDEXES = {
+    "associations": [
+        ("idx_assoc_name", "name"),
+        ("idx_assoc_coords", "lat, lon"),
+        ("idx_assoc_size", "size_bucket"),
+    ],
+    "companies": [
+        ("idx_comp_name", "name"),
+        ("idx_comp_coords", "lat, lon"),
+        ("idx_comp_size", "size_bucket"),
+        ("idx_comp_industry", "industry"),
+    ],
+}
+
+# Full-text search indexes (MySQL specific)
+FULLTEXT_INDEXES = {
+    "associations": ("ft_assoc_name", "name"),
+    "companies": ("ft_comp_name", "name"),
+}
+
+
+def existing_indexes(conn, table):
+    """Names of the indexes already defined on `table`."""
+    return {row[2] for row in conn.execute(text(f"SHOW INDEXES FROM {table}"))}
+
+
+def add_missing_indexes(conn, table, indexes, existing):
+    """
+    Add the indexes not yet on `table` with a single ALTER TABLE, so MySQL
+    rebuilds the table once and the batch costs one round-trip.
+    """
+    missing = [(name, columns) for name, columns in indexes if name not in existing]
+    if missing:
+        clauses = ", ".join(f"ADD INDEX {name} ({columns})" for name, columns in missing)
+        conn.execute(text(f"ALTER TABLE {table} {clauses}"))
+    return [name for name, _ in missing]
+
+
 def optimize_database():
     """Add indexes for better query performance."""
     engine = get_engine()
 
     with engine.connect() as conn:
-        # Add indexes for associations
-        print("Adding indexes for associations table...")
-        try:
-            conn.execute(text("CREATE INDEX idx_assoc_name ON associations(name)"))
-            conn.execute(text("CREATE INDEX idx_assoc_coords ON associations(lat, lon)"))
-            conn.execute(text("CREATE INDEX idx_assoc_size ON associations(size_bucket)"))
-            conn.commit()
-            print("✅ Association indexes created")
-        except Exception as e:
-            if "Duplicate" not in str(e):
-                print(f"⚠️ Error creating association indexes: {e}")
-
-        # Add indexes for companies
-        print("\nAdding indexes for companies table...")
-        try:
-            conn.execute(text("CREATE INDEX idx_comp_name ON companies(name)"))
-            conn.execute(text("CREATE INDEX idx_comp_coords ON companies(lat, lon)"))
-            conn.execute(text("CREATE INDEX idx_comp_size ON companies(size_bucket)"))
-            conn.execute(text("CREATE INDEX idx_comp_industry ON companies(industry)"))
-
-            # Spatial index for distance queries
-            conn.execute(text("""
-                              CREATE INDEX idx_comp_spatial ON companies (lat, lon) WHERE lat IS NOT NULL AND lon IS NOT NULL
-                              """))
-            conn.commit()
-            print("✅ Company indexes created")
-        except Exception as e:
-            if "Duplicate" not in str(e):
-                print(f"⚠️ Error creating company indexes: {e}")
+        for table, indexes in INDEXES.items():
+            print(f"Adding indexes for {table} table...")
+            existing = set()
+            try:
+                existing = existing_indexes(conn, table)
+                added = add_missing_indexes(conn, table, indexes, existing)
+                conn.commit()
+                print(f"✅ {table.capitalize()} indexes created: {', '.join(added) or 'none missing'}")
+            except Exception as e:
+                print(f"⚠️ Error creating {table} indexes: {e}")
 
-        # Add full-text search indexes (MySQL specific)
-        print("\nAdding full-text search indexes...")
-        try:
-            conn.execute(text("CREATE FULLTEXT INDEX ft_assoc_name ON associations(name)"))
-            conn.execute(text("CREATE FULLTEXT INDEX ft_comp_name ON companies(name)"))
-            conn.commit()
-            print("✅ Full-text indexes created")
-        except Exception as e:
-            if "Duplicate" not in str(e) and "doesn't support" not in str(e):
-                print(f"⚠️ Error creating full-text indexes: {e}")
+            # Full-text indexes need their own statement (InnoDB adds one at a time)
+            name, column = FULLTEXT_INDEXES[table]
+            if name not in existing:
+                try:
+                    conn.execute(text(f"CREATE FULLTEXT INDEX {name} ON {table}({column})"))
+                    conn.commit()
+                    print(f"✅ Full-text index {name} created")
+                except Exception as e:
+                    if "doesn't support" not in str(e):
+                        print(f"⚠️ Error creating full-text index {name}: {e}")
+            print()
 
         # Analyze tables for optimization
-        print("\nOptimizing tables...")
+        print("Optimizing tables...")
         try:
-            conn.execute(text("ANALYZE TABLE associations"))
-            conn.execute(text("ANALYZE TABLE companies"))
+            conn.execute(text("ANALYZE TABLE associations, companies"))
             conn.commit()
             print("✅ Tables optimized")
         except Exception as e:
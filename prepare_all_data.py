@@ -41,11 +41,10 @@ def prepare_associations():
     # Create size buckets based on available data
     # Fixed size categories: Small (0-399), Medium (400-799), Large (800+)
     if 'member_count' in df.columns:
-        df['size_bucket'] = pd.cut(
-            df['member_count'].fillna(100),
-            bins=[0, 400, 800, float('inf')],  # Fixed: correct size boundaries
-            labels=['small', 'medium', 'large'],
-            right=False  # 0-399, 400-799, 800+
+        members = pd.to_numeric(df['member_count'], errors='coerce').fillna(100).to_numpy()
+        df['size_bucket'] = pd.Categorical.from_codes(
+            np.searchsorted([400, 800], members, side='right'),  # 0-399, 400-799, 800+
+            categories=['small', 'medium', 'large']
         )
     else:
         # Fallback: assign random realistic distribution
@@ -107,10 +106,10 @@ def prepare_companies():
     # Create size buckets based on employee count if available
     if 'employee_count' in df.columns or 'employees' in df.columns:
         emp_col = 'employee_count' if 'employee_count' in df.columns else 'employees'
-        df['size_bucket'] = pd.cut(
-            df[emp_col].fillna(10),
-            bins=[0, 10, 50, 250, float('inf')],
-            labels=['small', 'medium', 'large', 'enterprise']
+        employees = pd.to_numeric(df[emp_col], errors='coerce').fillna(10).to_numpy()
+        df['size_bucket'] = pd.Categorical.from_codes(
+            np.searchsorted([10, 50, 250], employees, side='left'),  # 1-10, 11-50, 51-250, 251+
+            categories=['small', 'medium', 'large', 'enterprise']
         )
     else:
         # Fallback: create realistic distribution
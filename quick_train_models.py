@@ -8,13 +8,11 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import joblib
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 from sqlalchemy import text
 
 from golden_goal.core.db import get_engine
+from golden_goal.ml.pipeline import fit_location_clusters, save_model
 
 
 def train_models():
@@ -52,14 +50,8 @@ def train_models():
     # Train default model (small/medium)
     if len(small_medium) > 5:
         print(f"\nTraining default model with {len(small_medium)} points...")
-        X = np.array(small_medium)
-
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-
         n_clusters = min(5, len(small_medium) // 10)
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        kmeans.fit(X_scaled)
+        scaler, kmeans = fit_location_clusters(np.array(small_medium), n_clusters, n_init=10)
 
         model_data = {
             'kmeans': kmeans,
@@ -69,20 +61,14 @@ def train_models():
         }
 
         path = models_dir / "kmeans.joblib"
-        joblib.dump(model_data, path)
+        save_model(model_data, path)
         print(f"✓ Saved default model to {path}")
 
     # Train large model
     if len(large) > 3:
         print(f"\nTraining large model with {len(large)} points...")
-        X = np.array(large)
-
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-
         n_clusters = min(3, len(large) // 5)
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        kmeans.fit(X_scaled)
+        scaler, kmeans = fit_location_clusters(np.array(large), n_clusters, n_init=10)
 
         model_data = {
             'kmeans': kmeans,
@@ -92,7 +78,7 @@ def train_models():
         }
 
         path = models_dir / "kmeans_large.joblib"
-        joblib.dump(model_data, path)
+        save_model(model_data, path)
         print(f"✓ Saved large model to {path}")
 
     print("\nModels trained successfully!")
@@ -10,6 +10,7 @@ Run this to fix the feature dimension mismatch.
 from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.cluster import KMeans
 
@@ -42,7 +43,7 @@ def retrain_models():
     df['size_numeric'] = df['size_bucket'].apply(size_bucket_to_numeric)
 
     # Prepare features - using lat, lon, size_numeric (3 features)
-    features = df[['lat', 'lon', 'size_numeric']].values
+    features = np.ascontiguousarray(df[['lat', 'lon', 'size_numeric']].to_numpy(dtype=np.float32))
 
     # Create models directory
     models_dir = Path(__file__).resolve().parents[0] / "models"
@@ -52,7 +53,7 @@ def retrain_models():
     default_data = df[df['size_bucket'].isin(['small', 'medium'])]
 
     if len(default_data) > 5:
-        default_features = default_data[['lat', 'lon', 'size_numeric']].values
+        default_features = np.ascontiguousarray(default_data[['lat', 'lon', 'size_numeric']].to_numpy(dtype=np.float32))
         default_kmeans = KMeans(n_clusters=min(5, len(default_data)), random_state=42)
         default_kmeans.fit(default_features)
         joblib.dump(default_kmeans, models_dir / "kmeans.joblib")
@@ -67,7 +68,7 @@ def retrain_models():
     # Train large model
     large_data = df[df['size_bucket'] == 'large']
     if len(large_data) > 3:
-        large_features = large_data[['lat', 'lon', 'size_numeric']].values
+        large_features = np.ascontiguousarray(large_data[['lat', 'lon', 'size_numeric']].to_numpy(dtype=np.float32))
         large_kmeans = KMeans(n_clusters=min(3, len(large_data)), random_state=42)
         large_kmeans.fit(large_features)
         joblib.dump(large_kmeans, models_dir / "kmeans_large.joblib")
@@ -13,7 +13,7 @@ setup(
         "plotly",
         "sqlalchemy",
         "pymysql",
-        "scikit-learn",
+        "scikit-learn>=1.2",
         "joblib",
     ],
 )
@@ -6,10 +6,12 @@ import pandas as pd
 
 from golden_goal.core.db import get_engine
 
-df = pd.read_csv('../final/data/gothenburg_associations.csv')
+df = pd.read_csv('../final/data/gothenburg_associations.csv', dtype={'Post Nr': str})
+# "Post Nr Postort" in one str.cat pass; a missing street address stays missing
+postal = df['Post Nr'].str.cat(df['Postort'], sep=' ', na_rep='').str.strip()
 df_clean = pd.DataFrame({
     'name': df['Namn'],
-    'address': df['Adress'] + ', ' + df['Post Nr'].fillna('') + ' ' + df['Postort'].fillna(''),
+    'address': df['Adress'].str.cat(postal, sep=', '),
     'member_count': 100,  # Default value
     'lat': 57.7089,  # Default Gothenburg coordinates
     'lon': 11.9746,
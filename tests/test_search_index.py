@@ -0,0 +1,92 @@
+"""
+Tests for the vectorized search helpers in golden_goal.services.service:
+the name index and scorer, top-k selection and the ball-tree radius lookup.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from golden_goal.ml.pipeline import haversine
+from golden_goal.services.service import GoldenGoalService
+
+NAMES = [
+    "IFK Göteborg",
+    "IFK Göteborg Futsal",
+    "BK Häcken",
+    "BK Häcken FF",
+    "Örgryte IS",
+    "Göteborgs Kex AB",
+    "aaa bbb aaa",
+    "FC",
+    "",
+    "Kortedala IK",
+]
+
+QUERIES = ["ifk", "göteborg", "bk häcken", "ifk göteborg", "fc", "aa", "häck", "x", "kortedala ik"]
+
+
+@pytest.fixture
+def service():
+    """A service instance without loading any data files."""
+    return GoldenGoalService.__new__(GoldenGoalService)
+
+
+@pytest.fixture
+def name_index():
+    return GoldenGoalService._build_name_index(pd.DataFrame({"name": NAMES}))
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_score_names_matches_scalar_similarity(service, name_index, query):
+    expected = [service._calculate_text_similarity(query, name.lower()) for name in NAMES]
+    scores = GoldenGoalService._score_names(query, name_index)
+    np.testing.assert_allclose(scores, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_score_names_on_row_subset(name_index, query):
+    rows = np.array([1, 3, 4, 8])
+    full = GoldenGoalService._score_names(query, name_index)
+    np.testing.assert_allclose(GoldenGoalService._score_names(query, name_index, rows), full[rows])
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_candidate_rows_keep_every_search_hit(name_index, query):
+    scores = GoldenGoalService._score_names(query, name_index)
+    candidates = set(GoldenGoalService._candidate_rows(query, name_index))
+    assert set(np.flatnonzero(scores > 0.3)) <= candidates
+
+
+@pytest.mark.parametrize("k", [0, 1, 2, 3, 4, 6, 7, 10])
+def test_top_k_matches_stable_sort(k):
+    scores = np.array([0.5, 0.9, 0.5, 0.7, 0.9, 0.5, 0.1])
+    expected = np.argsort(-scores, kind="stable")[:k]
+    np.testing.assert_array_equal(GoldenGoalService._top_k(scores, k), expected)
+
+
+def test_top_k_keeps_ties_in_order():
+    scores = np.full(5, 0.4)
+    np.testing.assert_array_equal(GoldenGoalService._top_k(scores, 3), [0, 1, 2])
+    np.testing.assert_array_equal(GoldenGoalService._top_k(scores, 5), [0, 1, 2, 3, 4])
+    np.testing.assert_array_equal(GoldenGoalService._top_k(scores, 8), [0, 1, 2, 3, 4])
+
+
+@pytest.mark.parametrize("km", [0.5, 2.0, 5.0, 25.0])
+def test_rows_within_matches_brute_force(km):
+    rng = np.random.default_rng(0)
+    lats = 57.70 + rng.uniform(-0.2, 0.2, size=300)
+    lons = 11.97 + rng.uniform(-0.3, 0.3, size=300)
+    lats[:5] = 0.0  # rows without coordinates are never returned
+    arrays = GoldenGoalService._build_entity_arrays(
+        pd.DataFrame({"name": [f"Club {i}" for i in range(300)], "lat": lats, "lon": lons})
+    )
+
+    centre = (57.7089, 11.9746)
+    expected = [i for i in range(5, 300) if haversine(*centre, lats[i], lons[i]) <= km]
+    np.testing.assert_array_equal(GoldenGoalService._rows_within(arrays, *centre, km), expected)
+
+
+def test_rows_within_without_coordinates():
+    arrays = GoldenGoalService._build_entity_arrays(pd.DataFrame({"name": ["A"], "lat": [0.0], "lon": [0.0]}))
+    assert len(GoldenGoalService._rows_within(arrays, 57.7, 11.97, 10.0)) == 0
@@ -36,15 +36,9 @@ def transfer_sizes():
     name_to_size = dict(zip(prepared_df['name'], prepared_df['size_bucket']))
 
     # Check how many matches we can find
-    matches_found = 0
-    unmatched = []
-
-    for idx, row in geocoded_df.iterrows():
-        name = row['name']
-        if name in name_to_size:
-            matches_found += 1
-        else:
-            unmatched.append(name)
+    matched = geocoded_df['name'].isin(name_to_size.keys())
+    matches_found = int(matched.sum())
+    unmatched = geocoded_df.loc[~matched, 'name'].tolist()
 
     print(f"\n📊 Matching statistics:")
     print(f"  - Matches found: {matches_found}/{len(geocoded_df)}")
@@ -4,6 +4,7 @@ verify_scoring_fix.py - Quick script to verify scoring is fixed
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -28,17 +29,21 @@ def verify_scoring():
         "BK Häcken"
     ]
 
-    for assoc_name in test_associations:
-        print(f"\nTesting: {assoc_name}")
-        print("-" * 30)
-
-        # Get recommendations
-        recommendations = service.recommend(
+    # Get recommendations for all associations concurrently; each call is independent
+    def recommend(assoc_name):
+        return service.recommend(
             association_name=assoc_name,
             top_n=10,
             max_distance=20
         )
 
+    with ThreadPoolExecutor(max_workers=min(8, len(test_associations))) as executor:
+        all_recommendations = list(executor.map(recommend, test_associations))
+
+    for assoc_name, recommendations in zip(test_associations, all_recommendations):
+        print(f"\nTesting: {assoc_name}")
+        print("-" * 30)
+
         if recommendations.empty:
             print("  ✗ No recommendations found")
             continue